@@ -1,24 +1,38 @@
 import sys
 import importlib
+import importlib.util
 import json
 import argparse
+from importlib import metadata
 from pathlib import Path
-from typing import List, Tuple, Dict
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich import box
+from typing import List, Tuple, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.table import Table
 
 # Add project root to Python path so we can import from src/
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-console = Console()
-
 # Verificar se é modo JSON antes de inicializar logs
 JSON_MODE = '--json' in sys.argv
 
+# Informações de hardware (simulado) - parte estática da saída JSON
+HARDWARE_INFO = {
+    "cpu": "Intel/AMD CPU",
+    "memory": "8GB+ RAM",
+    "gpu": "Integrated/Dedicated GPU",
+}
+
+# Modelos Whisper (simulado) - montados uma única vez no carregamento do módulo
+WHISPER_MODELS = (
+    {"name": "tiny", "size": "39MB", "status": "available"},
+    {"name": "base", "size": "74MB", "status": "available"},
+    {"name": "small", "size": "244MB", "status": "available"},
+    {"name": "medium", "size": "769MB", "status": "available"},
+    {"name": "large-v3", "size": "1550MB", "status": "available"},
+)
+
 def check_python_version() -> Tuple[bool, str]:
     """Verifica se a versão do Python é >= 3.8"""
     version = sys.version_info
@@ -29,32 +43,47 @@ def check_python_version() -> Tuple[bool, str]:
     else:
         return False, f"Python {version.major}.{version.minor}.{version.micro} (Requerido: >= 3.8)"
 
+# Distribuição -> módulo importável de cada dependência verificada
+DEPENDENCIES = {
+    'rich': 'rich',
+    'loguru': 'loguru',
+    'pydantic': 'pydantic',
+    'python-dotenv': 'dotenv',
+    'pyaudiowpatch': 'pyaudiowpatch',
+}
+
+# Backends de áudio com extensão nativa: precisam de import real, pois find_spec
+# aprova um módulo cujo carregamento falha (ex.: DLL ausente)
+NATIVE_MODULES = frozenset({'pyaudiowpatch', 'pyaudio'})
+
+def _have(module: str) -> bool:
+    """Verifica se um módulo está instalado (importando de fato os nativos)"""
+    if module not in NATIVE_MODULES:
+        return importlib.util.find_spec(module) is not None
+    try:
+        importlib.import_module(module)
+        return True
+    except (ImportError, OSError):
+        return False
+
+def _dist_version(dist: str) -> str:
+    """Lê a versão instalada a partir dos metadados do pacote"""
+    try:
+        return metadata.version(dist)
+    except metadata.PackageNotFoundError:
+        return 'Desconhecida'
+
 def check_dependencies() -> Dict[str, Tuple[bool, str]]:
     """Verifica se as dependências estão instaladas"""
-    dependencies = ['rich', 'loguru', 'pydantic', 'python-dotenv', 'pyaudiowpatch']
     results = {}
     
-    for dep in dependencies:
-        try:
-            if dep == 'pyaudiowpatch':
-                # Verificação especial para pyaudiowpatch
-                try:
-                    module = importlib.import_module('pyaudiowpatch')
-                    version = getattr(module, '__version__', 'Desconhecida')
-                    results[dep] = (True, f"v{version}")
-                except ImportError:
-                    # Fallback para pyaudio padrão
-                    try:
-                        module = importlib.import_module('pyaudio')
-                        version = getattr(module, '__version__', 'Desconhecida')
-                        results[dep] = (True, f"pyaudio v{version} (fallback)")
-                    except ImportError:
-                        results[dep] = (False, "Não instalado")
-            else:
-                module = importlib.import_module(dep.replace('-', '_'))
-                version = getattr(module, '__version__', 'Desconhecida')
-                results[dep] = (True, f"v{version}")
-        except ImportError:
+    for dep, module in DEPENDENCIES.items():
+        if _have(module):
+            results[dep] = (True, f"v{_dist_version(dep)}")
+        elif dep == 'pyaudiowpatch' and _have('pyaudio'):
+            # Fallback para pyaudio padrão
+            results[dep] = (True, f"pyaudio v{_dist_version('PyAudio')} (fallback)")
+        else:
             results[dep] = (False, "Não instalado")
     
     return results
@@ -74,7 +103,7 @@ def check_directory_structure() -> Dict[str, Tuple[bool, str]]:
     
     results = {}
     for name, path in required_dirs.items():
-        if path.exists() and path.is_dir():
+        if path.is_dir():  # Um único stat: is_dir() já é False para caminhos inexistentes
             results[name] = (True, "Existe")
         else:
             results[name] = (False, "Não encontrado")
@@ -193,8 +222,20 @@ def check_audio_system() -> Dict[str, Tuple[bool, str]]:
     
     return results
 
-def create_status_table(checks: Dict[str, List[Tuple[str, bool, str]]]) -> Table:
+# Status -> (status JSON, ícone)
+_STATUS_FIELDS = {True: ("ok", "✅"), False: ("error", "❌")}
+
+def _component(name: str, ok: bool, details: str) -> Dict[str, str]:
+    """Converte um resultado (ok, detalhes) no registro JSON do Raycast"""
+    status, icon = _STATUS_FIELDS[bool(ok)]
+    return {"name": name, "status": status, "message": details, "icon": icon}
+
+def create_status_table(checks: Dict[str, List[Tuple[str, bool, str]]]) -> "Table":
     """Cria uma tabela com o status das verificações"""
+    from rich.table import Table
+    from rich.text import Text
+    from rich import box
+    
     table = Table(title="[SEARCH] Status do Sistema MeetingScribe", box=box.ROUNDED)
     
     table.add_column("Categoria", style="bold cyan", min_width=15)
@@ -249,49 +290,38 @@ def main():
         components = []
         
         # Sistema
-        components.append({"name": "Python", "status": "ok" if python_ok else "error", "message": python_details, "icon": "✅" if python_ok else "❌"})
-        components.append({"name": "Configuração", "status": "ok" if config_ok else "error", "message": config_details, "icon": "✅" if config_ok else "❌"})
+        components.append(_component("Python", python_ok, python_details))
+        components.append(_component("Configuração", config_ok, config_details))
         
         # Dependências
         for dep, (status, details) in dependencies.items():
-            components.append({"name": dep, "status": "ok" if status else "error", "message": details, "icon": "✅" if status else "❌"})
+            components.append(_component(dep, status, details))
         
         # Diretórios
         for dir_name, (status, details) in directories.items():
-            components.append({"name": f"Dir: {dir_name}", "status": "ok" if status else "error", "message": details, "icon": "✅" if status else "❌"})
+            components.append(_component(f"Dir: {dir_name}", status, details))
         
         # Sistema de Áudio
         for component, (status, details) in audio_system.items():
-            components.append({"name": f"Audio: {component}", "status": "ok" if status else "error", "message": details, "icon": "✅" if status else "❌"})
-        
-        # Informações de hardware (simulado)
-        hardware = {
-            "cpu": "Intel/AMD CPU",
-            "memory": "8GB+ RAM",
-            "gpu": "Integrated/Dedicated GPU",
-            "audio_devices": len(audio_system)
-        }
-        
-        # Modelos Whisper (simulado)
-        models = [
-            {"name": "tiny", "size": "39MB", "status": "available"},
-            {"name": "base", "size": "74MB", "status": "available"},
-            {"name": "small", "size": "244MB", "status": "available"},
-            {"name": "medium", "size": "769MB", "status": "available"},
-            {"name": "large-v3", "size": "1550MB", "status": "available"}
-        ]
+            components.append(_component(f"Audio: {component}", status, details))
         
         result = {
             "overall": "success" if passed_checks == total_checks else "error",
             "components": components,
-            "hardware": hardware,
-            "models": models
+            "hardware": {**HARDWARE_INFO, "audio_devices": len(audio_system)},
+            "models": WHISPER_MODELS
         }
         
-        print(json.dumps(result, indent=2, ensure_ascii=True))
+        # Escrever direto no stdout, sem montar a string JSON inteira em memória
+        json.dump(result, sys.stdout, indent=2, ensure_ascii=True)
+        sys.stdout.write("\n")
         return passed_checks == total_checks
     
-    # Interactive mode (original)
+    # Interactive mode (original) - rich só é carregado aqui; o modo JSON do Raycast não o usa
+    from rich.console import Console
+    from rich.panel import Panel
+    
+    console = Console()
     console.print(Panel(
         "[bold blue]Sistema de Verificacao do MeetingScribe[/bold blue]\n"
         "Verificando componentes essenciais...",
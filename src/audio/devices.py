@@ -13,8 +13,10 @@ Python: >=3.8
 import sys
 import json
 import argparse
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from functools import cached_property
 from loguru import logger
 
 try:
@@ -30,6 +32,22 @@ except ImportError:
         PYAUDIO_AVAILABLE = False
         logger.error("No audio library available")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Common indicators of loopback devices (matched against the lowercased name)
+_LOOPBACK_INDICATORS = (
+    'loopback',
+    'stereo mix',
+    'what u hear',
+    'wave out mix',
+    'speakers (',  # Formato comum do WASAPI loopback
+    'headphones (',
+)
+
 
 @dataclass
 class AudioDevice:
@@ -54,6 +72,11 @@ class AudioDevice:
     host_api: str
     is_loopback: bool = False
     is_default: bool = False
+    
+    @cached_property
+    def is_wasapi(self) -> bool:
+        """Whether the device belongs to the Windows WASAPI host API (computed once)."""
+        return self.host_api.lower() == 'windows wasapi'
 
 
 class AudioDeviceError(Exception):
@@ -75,16 +98,22 @@ class DeviceManager:
     audio mixer configuration.
     """
     
-    def __init__(self):
+    def __init__(self, audio: Optional[Any] = None):
         """
         Initializes the device manager.
         
+        Args:
+            audio: Existing PyAudio instance to reuse instead of initializing
+                a new one. A borrowed instance is not terminated by close().
+        
         Raises:
             AudioDeviceError: If it fails to initialize the audio system
             WASAPINotAvailableError: If WASAPI is not available
         """
-        self._audio = None
+        self._audio = audio
+        self._owns_audio = audio is None
         self._devices_cache = None
+        self._devices_by_index: Dict[int, AudioDevice] = {}
         self._initialize_audio_system()
     
     def _initialize_audio_system(self) -> None:
@@ -102,8 +131,9 @@ class DeviceManager:
             )
         
         try:
-            self._audio = pyaudio.PyAudio()
-            logger.info("Audio system initialized successfully")
+            if self._audio is None:
+                self._audio = pyaudio.PyAudio()
+                logger.info("Audio system initialized successfully")
             
             # Check if WASAPI is available
             if not self._is_wasapi_available():
@@ -156,37 +186,37 @@ class DeviceManager:
         logger.info("Looking for default speakers device with loopback support")
         
         try:
-            devices = self.list_all_devices()
-            # First, try to find an explicit loopback device
-            loopback_devices = [d for d in devices if d.is_loopback]
-            
-            if loopback_devices:
-                # Prefer default device among loopbacks
-                default_loopback = next((d for d in loopback_devices if d.is_default), None)
-                if default_loopback:
-                    logger.info(f"Default loopback device found: {default_loopback.name}")
-                    return default_loopback
-                
-                # If there is no default, take the first loopback
-                first_loopback = loopback_devices[0]
+            # Single pass: remember the default and first device of each kind
+            default_loopback = first_loopback = None
+            default_wasapi = first_wasapi = None
+            for d in self.list_all_devices():
+                if d.is_loopback:
+                    if d.is_default:
+                        default_loopback = d
+                        break
+                    if first_loopback is None:
+                        first_loopback = d
+                elif first_loopback is None and d.is_wasapi and d.max_output_channels > 0:
+                    if d.is_default and default_wasapi is None:
+                        default_wasapi = d
+                    if first_wasapi is None:
+                        first_wasapi = d
+            
+            # First, prefer an explicit loopback device (default one first)
+            if default_loopback:
+                logger.info(f"Default loopback device found: {default_loopback.name}")
+                return default_loopback
+            
+            if first_loopback:
                 logger.info(f"Using first loopback device: {first_loopback.name}")
                 return first_loopback
             
-            # Fallback: look for WASAPI output devices
-            wasapi_output_devices = [
-                d for d in devices 
-                if d.host_api.lower() == 'windows wasapi' and d.max_output_channels > 0
-            ]
-            
-            if wasapi_output_devices:
-                # Prefer default device
-                default_wasapi = next((d for d in wasapi_output_devices if d.is_default), None)
-                if default_wasapi:
-                    logger.info(f"Default WASAPI device found: {default_wasapi.name}")
-                    return default_wasapi
-                
-                # If there is no default, take the first one
-                first_wasapi = wasapi_output_devices[0]
+            # Fallback: WASAPI output devices (default one first)
+            if default_wasapi:
+                logger.info(f"Default WASAPI device found: {default_wasapi.name}")
+                return default_wasapi
+            
+            if first_wasapi:
                 logger.info(f"Using first WASAPI device: {first_wasapi.name}")
                 return first_wasapi
             
@@ -220,14 +250,22 @@ class DeviceManager:
             devices = []
             device_count = self._audio.get_device_count()
             
+            # The default devices do not change during enumeration: query them once
+            default_indices = self._default_device_indices()
+            # hostApi index -> API name; a handful of APIs are shared by every
+            # device, so each is queried once and all devices share one string
+            host_api_names: Dict[int, str] = {}
+            
             logger.debug(f"Total devices detected: {device_count}")
             
             for i in range(device_count):
                 try:
                     device_info = self._audio.get_device_info_by_index(i)
-                    host_api_info = self._audio.get_host_api_info_by_index(
-                        device_info['hostApi']
-                    )
+                    host_api_index = device_info['hostApi']
+                    host_api = host_api_names.get(host_api_index)
+                    if host_api is None:
+                        host_api = self._audio.get_host_api_info_by_index(host_api_index)['name']
+                        host_api_names[host_api_index] = host_api
                     
                     device = AudioDevice(
                         index=i,
@@ -235,9 +273,9 @@ class DeviceManager:
                         max_input_channels=device_info['maxInputChannels'],
                         max_output_channels=device_info['maxOutputChannels'],
                         default_sample_rate=device_info['defaultSampleRate'],
-                        host_api=host_api_info['name'],
+                        host_api=host_api,
                         is_loopback=self._is_loopback_device(device_info),
-                        is_default=self._is_default_device(device_info, i)
+                        is_default=i in default_indices
                     )
                     
                     devices.append(device)
@@ -255,6 +293,7 @@ class DeviceManager:
                     continue
             
             self._devices_cache = devices
+            self._devices_by_index = {d.index: d for d in devices}
             logger.info(f"Total of {len(devices)} devices listed successfully")
             
             return devices
@@ -275,19 +314,8 @@ class DeviceManager:
         """
         device_name = device_info['name'].lower()
         
-        # Common indicators of loopback devices
-        loopback_indicators = [
-            'loopback',
-            'stereo mix',
-            'what u hear',
-            'wave out mix',
-            'speakers (',  # Formato comum do WASAPI loopback
-            'headphones (',
-        ]
-        
-        for indicator in loopback_indicators:
-            if indicator in device_name:
-                return True
+        if any(indicator in device_name for indicator in _LOOPBACK_INDICATORS):
+            return True
         
         # Check if it only has input channels (typical for loopback)
         if (device_info['maxInputChannels'] > 0 and 
@@ -297,32 +325,23 @@ class DeviceManager:
         
         return False
     
-    def _is_default_device(self, device_info: Dict[str, Any], device_index: int) -> bool:
+    def _default_device_indices(self) -> frozenset:
         """
-        Checks if a device is the system's default device.
+        Gets the indices of the system's default input and output devices.
         
-        Args:
-            device_info: Device information
-            device_index: Device index
-            
         Returns:
-            bool: True if it is the default device
+            frozenset: Indices of the default devices (empty if none can be queried)
         """
-        try:
-            # Check if it is the default input device
-            default_input = self._audio.get_default_input_device_info()
-            if default_input and default_input['index'] == device_index:
-                return True
-            
-            # Check if it is the default output device
-            default_output = self._audio.get_default_output_device_info()
-            if default_output and default_output['index'] == device_index:
-                return True
-            
-        except Exception as e:
-            logger.debug(f"Error checking default device for {device_index}: {e}")
-        
-        return False
+        indices = set()
+        for query in (self._audio.get_default_input_device_info,
+                      self._audio.get_default_output_device_info):
+            try:
+                info = query()
+                if info:
+                    indices.add(info['index'])
+            except Exception as e:
+                logger.debug(f"Error querying default device: {e}")
+        return frozenset(indices)
     
     def get_device_by_index(self, index: int) -> Optional[AudioDevice]:
         """
@@ -334,8 +353,8 @@ class DeviceManager:
         Returns:
             Optional[AudioDevice]: Found device or None
         """
-        devices = self.list_all_devices()
-        return next((d for d in devices if d.index == index), None)
+        self.list_all_devices()  # Populates the index map alongside the cache
+        return self._devices_by_index.get(index)
     
     def get_devices_by_api(self, api_name: str) -> List[AudioDevice]:
         """
@@ -358,19 +377,24 @@ class DeviceManager:
             List[AudioDevice]: List of devices that can be used for recording
         """
         devices = self.list_all_devices()
-        recording_devices = [d for d in devices if d.max_input_channels > 0]
-        # Sort by preference: WASAPI loopback first, then default, then others
-        def sort_key(device):
-            score = 0
-            if device.host_api.lower() == 'windows wasapi':
-                score += 30
-            if device.is_loopback:
-                score += 20  
-            if device.is_default:
-                score += 10
-            return -score  # Negative for descending order
-        
-        return sorted(recording_devices, key=sort_key)
+        # Sort by preference: WASAPI loopback first, then default, then others.
+        # Scores are computed inline while filtering, so the sort runs on plain
+        # (score, position) tuples and preserves enumeration order on ties.
+        scored = [
+            (
+                -(
+                    (30 if d.is_wasapi else 0)
+                    + (20 if d.is_loopback else 0)
+                    + (10 if d.is_default else 0)
+                ),
+                position,
+                d,
+            )
+            for position, d in enumerate(devices)
+            if d.max_input_channels > 0
+        ]
+        scored.sort(key=itemgetter(0, 1))
+        return [d for _, _, d in scored]
     
     def get_system_default_input(self) -> Optional[AudioDevice]:
         """
@@ -427,13 +451,15 @@ class DeviceManager:
         """
         if self._audio:
             try:
-                self._audio.terminate()
-                logger.info("Audio system terminated")
+                if self._owns_audio:
+                    self._audio.terminate()
+                    logger.info("Audio system terminated")
             except Exception as e:
                 logger.warning(f"Error terminating audio system: {e}")
             finally:
                 self._audio = None
                 self._devices_cache = None
+                self._devices_by_index = {}
     
     def __enter__(self):
         """Context manager entry."""
@@ -444,6 +470,44 @@ class DeviceManager:
         self.close()
 
 
+# Field names of AudioDevice, resolved once for dict conversion
+_DEVICE_FIELDS = tuple(f.name for f in fields(AudioDevice))
+
+
+def _device_to_dict(device: AudioDevice, **overrides: Any) -> Dict[str, Any]:
+    """
+    Convert a device into a JSON-ready dict.
+
+    AudioDevice only holds scalar fields, so a flat attribute copy replaces
+    the recursive deep copy done by dataclasses.asdict().
+
+    Args:
+        device: Device to convert
+        **overrides: Keys to add or replace in the result
+
+    Returns:
+        Dict[str, Any]: Device fields merged with the overrides
+    """
+    data = {name: getattr(device, name) for name in _DEVICE_FIELDS}
+    data.update(overrides)
+    return data
+
+
+def _dumps_json(data: Any) -> str:
+    """
+    Serialize data as indented JSON, using orjson when it is installed.
+
+    Args:
+        data: JSON-compatible data
+
+    Returns:
+        str: JSON document (non-ASCII characters kept as-is)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
 def main():
     """
     Main function for testing and demonstrating the DeviceManager.
@@ -464,55 +528,43 @@ def main():
                     # Find the best default loopback device
                     default_speakers = dm.get_default_speakers()
                     if default_speakers and default_speakers.max_input_channels > 0:
-                        device_list.append({
-                            "id": "system_output",
-                            "name": "Same as System (Output Loopback)",
-                            "index": default_speakers.index,
-                            "max_input_channels": default_speakers.max_input_channels,
-                            "max_output_channels": default_speakers.max_output_channels,
-                            "default_sample_rate": default_speakers.default_sample_rate,
-                            "host_api": default_speakers.host_api,
-                            "is_loopback": default_speakers.is_loopback,
-                            "is_default": True,
-                            "is_system_default": True
-                        })
+                        device_list.append(_device_to_dict(
+                            default_speakers,
+                            id="system_output",
+                            name="Same as System (Output Loopback)",
+                            is_default=True,
+                            is_system_default=True
+                        ))
                     
                     # Add option for default input if it's different and suitable
                     default_input = dm.get_system_default_input()
                     if (default_input and default_input.max_input_channels > 0 and 
                         (not default_speakers or default_input.index != default_speakers.index)):
-                        device_list.append({
-                            "id": "system_input",
-                            "name": "Same as System (Microphone)",
-                            "index": default_input.index,
-                            "max_input_channels": default_input.max_input_channels,
-                            "max_output_channels": default_input.max_output_channels,
-                            "default_sample_rate": default_input.default_sample_rate,
-                            "host_api": default_input.host_api,
-                            "is_loopback": default_input.is_loopback,
-                            "is_default": True,
-                            "is_system_default": True
-                        })
+                        device_list.append(_device_to_dict(
+                            default_input,
+                            id="system_input",
+                            name="Same as System (Microphone)",
+                            is_default=True,
+                            is_system_default=True
+                        ))
                     
                     # Add devices suitable for recording (only with input channels > 0)
                     for device in devices:
                         if device.max_input_channels > 0:  # Additional filter
-                            device_dict = asdict(device)
-                            device_dict['id'] = str(device.index)
-                            device_dict['is_system_default'] = False
-                            device_list.append(device_dict)
+                            device_list.append(_device_to_dict(
+                                device, id=str(device.index), is_system_default=False
+                            ))
                 else:
                     # List all devices
                     devices = dm.list_all_devices()
                     device_list = []
                     
                     for device in devices:
-                        device_dict = asdict(device)
-                        device_dict['id'] = str(device.index)
-                        device_dict['is_system_default'] = False
-                        device_list.append(device_dict)
+                        device_list.append(_device_to_dict(
+                            device, id=str(device.index), is_system_default=False
+                        ))
                 
-                print(json.dumps(device_list, indent=2, ensure_ascii=False))
+                print(_dumps_json(device_list))
                 return
         except Exception as e:
             print(json.dumps({"error": str(e)}))
@@ -535,7 +587,7 @@ def main():
                     status_icons.append("[DEFAULT] Default")
                 if device.is_loopback:
                     status_icons.append("[LOOP] Loopback")
-                if device.host_api.lower() == 'windows wasapi':
+                if device.is_wasapi:
                     status_icons.append("[WASAPI] WASAPI")
                 
                 status = " | ".join(status_icons) if status_icons else ""
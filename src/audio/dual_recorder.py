@@ -9,6 +9,8 @@ Version: 1.0.0
 Python: >=3.8
 """
 
+import math
+import importlib.util
 import wave
 import threading
 import time
@@ -17,7 +19,7 @@ import queue
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Callable, Dict, Any, List, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from loguru import logger
 from .devices import DeviceManager, AudioDevice, AudioDeviceError
@@ -28,11 +30,14 @@ try:
 except ImportError:
     NUMPY_AVAILABLE = False
 
-try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
+# pydub is only needed for M4A export: probe for it here, import it on first use
+PYDUB_AVAILABLE = importlib.util.find_spec("pydub") is not None
+
+# Path is immutable, so one instance can be shared as the dataclass default
+DEFAULT_OUTPUT_DIR = Path("storage/recordings")
+
+# Extensions stripped from caller-supplied filenames before the configured one is added
+AUDIO_EXTENSIONS = frozenset(('.wav', '.m4a', '.mp4'))
 
 try:
     import pyaudiowpatch as pyaudio
@@ -64,6 +69,7 @@ class DualRecordingConfig:
         audio_format: File format ('wav' or 'm4a')
         mic_volume: Microphone volume multiplier (0.0-2.0, default 1.0)
         speaker_volume: Speaker volume multiplier (0.0-2.0, default 1.0)
+        queue_seconds: Audio each reader queue buffers before dropping oldest chunks
     """
     speaker_device: Optional[AudioDevice] = None
     microphone_device: Optional[AudioDevice] = None
@@ -72,10 +78,11 @@ class DualRecordingConfig:
     chunk_size: int = 4096    # Buffer size
     format: int = pyaudio.paInt16 if PYAUDIO_AVAILABLE else None
     max_duration: Optional[int] = None
-    output_dir: Path = field(default_factory=lambda: Path("storage/recordings"))
+    output_dir: Path = DEFAULT_OUTPUT_DIR
     audio_format: str = "wav"  # 'wav' or 'm4a'
     mic_volume: float = 1.0
     speaker_volume: float = 1.0
+    queue_seconds: float = 10.0  # >= the old fixed 100-chunk bound (~8.5 s at 48 kHz)
 
 
 @dataclass
@@ -143,12 +150,16 @@ class DualStreamRecorder:
         self._mic_queue: queue.Queue = queue.Queue(maxsize=100)
         self._frames: List[bytes] = []  # Mixed audio frames
         self._stats = None
+        self._start_monotonic = 0.0  # Monotonic start stamp for duration math
         self._progress_callback = None
         self._frames_captured = 0
         self._has_audio_detected = False
         self._audio_threshold = 100
         self._lock = threading.Lock()
         self._mic_opened_successfully = False  # Track if mic was opened
+        self._resample_grids: Dict[Tuple[int, int, int], Tuple[Any, Any]] = {}
+        self._mix_buffer = None  # Reusable float32 buffers for _mix_audio_frames
+        self._mix_scratch = None
 
         if not NUMPY_AVAILABLE:
             logger.warning("NumPy not available - audio mixing will be limited (speaker-only fallback)")
@@ -172,7 +183,7 @@ class DualStreamRecorder:
             bool: True if successfully configured both devices
         """
         try:
-            with DeviceManager() as dm:
+            with DeviceManager(self._audio) as dm:  # Reuse this recorder's PyAudio
                 # Get speaker/loopback device
                 speaker_device = dm.get_default_speakers()
                 if speaker_device and speaker_device.max_input_channels > 0:
@@ -181,10 +192,10 @@ class DualStreamRecorder:
                 else:
                     # Fallback: search for any loopback device
                     recording_devices = dm.get_recording_capable_devices()
-                    loopback_devices = [d for d in recording_devices if d.is_loopback]
-                    if loopback_devices:
-                        self._config.speaker_device = loopback_devices[0]
-                        logger.info(f"Fallback speaker device: {loopback_devices[0].name}")
+                    loopback_device = next((d for d in recording_devices if d.is_loopback), None)
+                    if loopback_device:
+                        self._config.speaker_device = loopback_device
+                        logger.info(f"Fallback speaker device: {loopback_device.name}")
                     else:
                         logger.warning("No speaker/loopback device found")
 
@@ -200,26 +211,28 @@ class DualStreamRecorder:
                             logger.info(f"Microphone device configured: {mic_device.name}")
                         else:
                             # Find a non-loopback input device
-                            all_devices = dm.list_all_devices()
-                            mic_candidates = [
-                                d for d in all_devices
-                                if d.max_input_channels > 0
-                                and not d.is_loopback
-                                and ('microphone' in d.name.lower() or 'mic' in d.name.lower())
-                            ]
-                            if mic_candidates:
-                                self._config.microphone_device = mic_candidates[0]
-                                logger.info(f"Found microphone: {mic_candidates[0].name}")
+                            # Single pass: first named microphone, plus the first
+                            # other non-loopback input as a fallback
+                            speaker_index = self._config.speaker_device.index if self._config.speaker_device else -1
+                            mic_candidate = None
+                            non_loopback_input = None
+                            for d in dm.list_all_devices():
+                                if d.max_input_channels <= 0 or d.is_loopback:
+                                    continue
+                                name = d.name.lower()
+                                if 'mic' in name:  # also matches 'microphone'
+                                    mic_candidate = d
+                                    break
+                                if non_loopback_input is None and d.index != speaker_index:
+                                    non_loopback_input = d
+                            if mic_candidate:
+                                self._config.microphone_device = mic_candidate
+                                logger.info(f"Found microphone: {mic_candidate.name}")
                             else:
-                                # Just find any non-loopback input
-                                non_loopback_inputs = [
-                                    d for d in all_devices
-                                    if d.max_input_channels > 0 and not d.is_loopback
-                                    and d.index != (self._config.speaker_device.index if self._config.speaker_device else -1)
-                                ]
-                                if non_loopback_inputs:
-                                    self._config.microphone_device = non_loopback_inputs[0]
-                                    logger.info(f"Using input device as mic: {non_loopback_inputs[0].name}")
+                                # Just use any non-loopback input
+                                if non_loopback_input:
+                                    self._config.microphone_device = non_loopback_input
+                                    logger.info(f"Using input device as mic: {non_loopback_input.name}")
                 else:
                     logger.warning("No microphone device found")
 
@@ -269,16 +282,16 @@ class DualStreamRecorder:
                     # Mono to stereo: duplicate the channel
                     samples = np.repeat(samples, 2)
                 elif src_channels == 2 and dst_channels == 1:
-                    # Stereo to mono: average channels
-                    samples = samples.reshape(-1, 2).mean(axis=1).astype(np.int16)
+                    # Stereo to mono: average channels in int32 (no float64 temporary)
+                    mono = np.add(samples[0::2], samples[1::2], dtype=np.int32)
+                    mono >>= 1
+                    samples = mono.astype(np.int16)
 
             # Handle sample rate conversion (simple resampling)
             if src_rate != dst_rate:
-                # Calculate new length
-                new_length = int(len(samples) * dst_rate / src_rate)
                 # Simple linear interpolation resampling
-                indices = np.linspace(0, len(samples) - 1, new_length)
-                samples = np.interp(indices, np.arange(len(samples)), samples).astype(np.int16)
+                indices, positions = self._resample_grid(len(samples), src_rate, dst_rate)
+                samples = np.interp(indices, positions, samples).astype(np.int16)
 
             return samples.tobytes()
 
@@ -286,6 +299,21 @@ class DualStreamRecorder:
             logger.warning(f"Audio format conversion failed: {e}, returning original")
             return data
 
+    def _resample_grid(self, src_length: int, src_rate: int, dst_rate: int) -> Tuple[Any, Any]:
+        """
+        Return the (target indices, source positions) interpolation grids for a chunk.
+
+        Chunks from a stream almost always have the same length, so the grids are
+        built once and reused, keyed by an integer tuple.
+        """
+        key = (src_length, src_rate, dst_rate)
+        grid = self._resample_grids.get(key)
+        if grid is None:
+            new_length = int(src_length * dst_rate / src_rate)
+            grid = (np.linspace(0, src_length - 1, new_length), np.arange(src_length))
+            self._resample_grids[key] = grid
+        return grid
+
     def _mix_audio_frames(self, speaker_data: bytes, mic_data: bytes) -> bytes:
         """
         Mix speaker and microphone audio data together.
@@ -298,33 +326,36 @@ class DualStreamRecorder:
             bytes: Mixed audio data
         """
         try:
-            # Convert to numpy arrays
-            speaker_samples = np.frombuffer(speaker_data, dtype=np.int16).astype(np.float32)
-            mic_samples = np.frombuffer(mic_data, dtype=np.int16).astype(np.float32)
-
-            # Apply volume adjustments
-            speaker_samples *= self._config.speaker_volume
-            mic_samples *= self._config.mic_volume
-
-            # Ensure same length (pad shorter one with zeros)
-            max_len = max(len(speaker_samples), len(mic_samples))
-            if len(speaker_samples) < max_len:
-                speaker_samples = np.pad(speaker_samples, (0, max_len - len(speaker_samples)))
-            if len(mic_samples) < max_len:
-                mic_samples = np.pad(mic_samples, (0, max_len - len(mic_samples)))
-
-            # Mix the audio (simple addition with clipping prevention)
-            mixed = speaker_samples + mic_samples
-
-            # Normalize to prevent clipping
-            max_val = np.max(np.abs(mixed))
+            # Zero-copy int16 views over the captured buffers
+            speaker_samples = np.frombuffer(speaker_data, dtype=np.int16)
+            mic_samples = np.frombuffer(mic_data, dtype=np.int16)
+            speaker_len = len(speaker_samples)
+            mic_len = len(mic_samples)
+            max_len = max(speaker_len, mic_len)
+
+            # Mix and scratch buffers are reused across chunks (only the mixing thread calls this)
+            if self._mix_buffer is None or len(self._mix_buffer) < max_len:
+                self._mix_buffer = np.empty(max_len, dtype=np.float32)
+                self._mix_scratch = np.empty(max_len, dtype=np.float32)
+            mixed = self._mix_buffer[:max_len]
+            scratch = self._mix_scratch[:mic_len]
+
+            # Apply volume adjustments while converting, then add in place;
+            # the shorter stream is implicitly zero-padded
+            np.multiply(speaker_samples, self._config.speaker_volume, out=mixed[:speaker_len])
+            mixed[speaker_len:] = 0.0
+            np.multiply(mic_samples, self._config.mic_volume, out=scratch)
+            mixed[:mic_len] += scratch
+
+            # Normalize to prevent clipping (peak from min/max, no abs() temporary)
+            max_val = max(float(mixed.max()), -float(mixed.min()))
             if max_val > 32767:
-                mixed = mixed * (32767 / max_val)
+                mixed *= 32767 / max_val
 
             # Convert back to int16
-            mixed = np.clip(mixed, -32768, 32767).astype(np.int16)
+            np.clip(mixed, -32768, 32767, out=mixed)
 
-            return mixed.tobytes()
+            return mixed.astype(np.int16).tobytes()
 
         except Exception as e:
             logger.warning(f"Audio mixing failed: {e}")
@@ -365,10 +396,9 @@ class DualStreamRecorder:
         expected_ext = f".{audio_format}"
 
         # Remove old extension if exists
-        for ext in ['.wav', '.m4a', '.mp4']:
-            if filename.endswith(ext):
-                filename = filename[:-len(ext)]
-                break
+        suffix = Path(filename).suffix
+        if suffix in AUDIO_EXTENSIONS:
+            filename = filename[:-len(suffix)]
 
         if not filename.endswith(expected_ext):
             filename += expected_ext
@@ -384,6 +414,7 @@ class DualStreamRecorder:
         speaker_name = self._config.speaker_device.name if self._config.speaker_device else "None"
         mic_name = self._config.microphone_device.name if self._config.microphone_device else "None"
 
+        self._start_monotonic = time.monotonic()
         self._stats = DualRecordingStats(
             start_time=datetime.now(),
             filename=str(filepath),
@@ -454,6 +485,10 @@ class DualStreamRecorder:
             target_rate = self._config.sample_rate
             target_channels = self._config.channels
 
+            # Size reader queues in seconds of audio rather than a fixed chunk count
+            self._speaker_queue = queue.Queue(maxsize=self._queue_capacity(speaker_rate))
+            self._mic_queue = queue.Queue(maxsize=self._queue_capacity(mic_rate))
+
             # Start recording
             self._recording = True
 
@@ -490,9 +525,22 @@ class DualStreamRecorder:
             self._cleanup_recording()
             raise DualStreamRecorderError(f"Failed to start recording: {e}") from e
 
-    def _calculate_audio_level(self, data: bytes) -> float:
+    def _queue_capacity(self, rate: int) -> int:
+        """Number of chunks that hold queue_seconds of audio at the given rate."""
+        return max(1, math.ceil(self._config.queue_seconds * rate / self._config.chunk_size))
+
+    @staticmethod
+    def _calculate_audio_level(data: bytes) -> float:
         """Calculate the RMS level of audio."""
         try:
+            if NUMPY_AVAILABLE:
+                # Zero-copy view over the buffer instead of a tuple of Python ints
+                samples = np.frombuffer(data, dtype='<i2', count=len(data) // 2)
+                if samples.size == 0:
+                    return 0.0
+                as_float = samples.astype(np.float32)
+                return float(np.sqrt(np.dot(as_float, as_float) / samples.size))
+
             samples = struct.unpack(f'<{len(data)//2}h', data)
             if samples:
                 sum_of_squares = sum(s ** 2 for s in samples)
@@ -511,13 +559,17 @@ class DualStreamRecorder:
         """
         logger.debug(f"{stream_name} reader thread started")
 
+        # Stream formats are fixed for the whole recording: decide once whether to convert
+        needs_conversion = NUMPY_AVAILABLE and (src_rate != target_rate or src_channels != target_channels)
+        chunk_size = self._config.chunk_size
+
         while self._recording:
             try:
                 if stream and not stream.is_stopped():
-                    data = stream.read(self._config.chunk_size, exception_on_overflow=False)
+                    data = stream.read(chunk_size, exception_on_overflow=False)
 
                     # Convert format if needed
-                    if NUMPY_AVAILABLE and data and (src_rate != target_rate or src_channels != target_channels):
+                    if needs_conversion and data:
                         data = self._convert_audio_format(data, src_rate, target_rate, src_channels, target_channels)
 
                     # Non-blocking put with timeout
@@ -546,11 +598,18 @@ class DualStreamRecorder:
         """Worker thread that mixes audio from reader threads."""
         logger.debug("Dual-stream mixing thread started")
 
+        # Block on the queue of the stream that is actually open; it paces the mixer
+        if self._speaker_stream is not None:
+            primary_queue, secondary_queue = self._speaker_queue, self._mic_queue
+        else:
+            primary_queue, secondary_queue = self._mic_queue, self._speaker_queue
+        speaker_is_primary = primary_queue is self._speaker_queue
+
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
 
             while self._recording:
-                current_time = time.time()
+                current_time = time.monotonic()
                 duration = current_time - start_time
 
                 # Check duration limit
@@ -560,43 +619,25 @@ class DualStreamRecorder:
                     break
 
                 try:
-                    speaker_data = None
-                    mic_data = None
-
-                    # Get data from queues (non-blocking)
+                    # Wait for the next primary frame (timeout keeps stop/duration checks responsive)
                     try:
-                        speaker_data = self._speaker_queue.get_nowait()
+                        primary_data = primary_queue.get(timeout=0.1)
                     except queue.Empty:
-                        pass
-
-                    try:
-                        mic_data = self._mic_queue.get_nowait()
-                    except queue.Empty:
-                        pass
-
-                    # Mix and store the audio
-                    if speaker_data or mic_data:
-                        with self._lock:
-                            if speaker_data and mic_data and NUMPY_AVAILABLE:
-                                # Mix both streams
-                                mixed_data = self._mix_audio_frames(speaker_data, mic_data)
-                                self._frames.append(mixed_data)
-                            elif speaker_data:
-                                self._frames.append(speaker_data)
-                            elif mic_data:
-                                self._frames.append(mic_data)
-
-                            self._frames_captured += 1
-                            self._stats.samples_recorded += self._config.chunk_size
-
-                            # Detect audio
-                            if not self._has_audio_detected:
-                                data_to_check = speaker_data or mic_data
-                                if data_to_check:
-                                    audio_level = self._calculate_audio_level(data_to_check)
-                                    if audio_level > self._audio_threshold:
-                                        self._has_audio_detected = True
-                                        logger.info(f"Audio detected! Level: {audio_level:.2f}")
+                        primary_data = None
+
+                    # Drain every chunk the other stream has ready: the first one is mixed
+                    # with the primary frame, any further ones are stored on their own so a
+                    # faster (or primary-starved) secondary stream never backs up and drops
+                    secondary_data = self._get_ready(secondary_queue)
+                    while True:
+                        if speaker_is_primary:
+                            self._store_frame(primary_data, secondary_data)
+                        else:
+                            self._store_frame(secondary_data, primary_data)
+                        if secondary_data is None:
+                            break
+                        primary_data = None
+                        secondary_data = self._get_ready(secondary_queue)
 
                     # Call progress callback
                     if self._progress_callback:
@@ -605,9 +646,6 @@ class DualStreamRecorder:
                         except Exception as e:
                             logger.warning(f"Error in progress callback: {e}")
 
-                    # Small pause - reader threads handle the actual stream timing
-                    time.sleep(0.005)
-
                 except Exception as e:
                     logger.warning(f"Error in mixing loop: {e}")
 
@@ -633,6 +671,41 @@ class DualStreamRecorder:
 
             logger.debug("Dual-stream mixing thread finished")
 
+    @staticmethod
+    def _get_ready(chunk_queue: queue.Queue) -> Optional[bytes]:
+        """Return the next queued chunk without blocking, or None if none is ready."""
+        try:
+            return chunk_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _store_frame(self, speaker_data: Optional[bytes], mic_data: Optional[bytes]) -> None:
+        """Mix (when both are present) and append one output frame."""
+        if not (speaker_data or mic_data):
+            return
+
+        with self._lock:
+            if speaker_data and mic_data and NUMPY_AVAILABLE:
+                # Mix both streams
+                mixed_data = self._mix_audio_frames(speaker_data, mic_data)
+                self._frames.append(mixed_data)
+            elif speaker_data:
+                self._frames.append(speaker_data)
+            elif mic_data:
+                self._frames.append(mic_data)
+
+            self._frames_captured += 1
+            self._stats.samples_recorded += self._config.chunk_size
+
+            # Detect audio
+            if not self._has_audio_detected:
+                data_to_check = speaker_data or mic_data
+                if data_to_check:
+                    audio_level = self._calculate_audio_level(data_to_check)
+                    if audio_level > self._audio_threshold:
+                        self._has_audio_detected = True
+                        logger.info(f"Audio detected! Level: {audio_level:.2f}")
+
     def stop_recording(self) -> DualRecordingStats:
         """
         Stop the current recording and save the file.
@@ -662,7 +735,7 @@ class DualStreamRecorder:
 
         # Finalize statistics
         self._stats.end_time = datetime.now()
-        self._stats.duration = (self._stats.end_time - self._stats.start_time).total_seconds()
+        self._stats.duration = time.monotonic() - self._start_monotonic
 
         # Save file
         try:
@@ -706,7 +779,10 @@ class DualStreamRecorder:
             wav_file.setsampwidth(self._audio.get_sample_size(self._config.format))
             wav_file.setframerate(self._config.sample_rate)
             with self._lock:
-                wav_file.writeframes(b''.join(self._frames))
+                # Write chunk by chunk instead of joining the whole recording into one
+                # bytes object (a second full copy of the audio in memory)
+                for frame in self._frames:
+                    wav_file.writeframesraw(frame)
 
         logger.debug(f"WAV file saved: {self._stats.filename}")
 
@@ -717,6 +793,17 @@ class DualStreamRecorder:
                 "pydub not available for M4A encoding. Install with: pip install pydub"
             )
 
+        # find_spec only locates pydub; importing it can still fail (e.g. a broken
+        # audioop/pyaudioop). Keep the recording rather than lose it after the fact.
+        try:
+            from pydub import AudioSegment
+        except ImportError as e:
+            wav_filename = str(Path(self._stats.filename).with_suffix('.wav'))
+            logger.warning(f"pydub failed to import ({e}); saving {wav_filename} as WAV instead")
+            self._stats.filename = wav_filename
+            self._save_as_wav()
+            return
+
         try:
             with self._lock:
                 audio_data = b''.join(self._frames)
@@ -781,8 +868,7 @@ class DualStreamRecorder:
             return None
 
         if self._recording:
-            current_time = datetime.now()
-            self._stats.duration = (current_time - self._stats.start_time).total_seconds()
+            self._stats.duration = time.monotonic() - self._start_monotonic
 
         return self._stats
 
@@ -9,6 +9,7 @@ Version: 1.0.0
 Python: >=3.8
 """
 
+import importlib.util
 import wave
 import threading
 import time
@@ -16,8 +17,7 @@ import struct
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Callable, Dict, Any
-from dataclasses import dataclass, field
-import locale
+from dataclasses import dataclass
 
 from loguru import logger
 from .devices import DeviceManager, AudioDevice, AudioDeviceError
@@ -28,11 +28,14 @@ try:
 except ImportError:
     NUMPY_AVAILABLE = False
 
-try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
+# pydub is only needed for M4A export: probe for it here, import it on first use
+PYDUB_AVAILABLE = importlib.util.find_spec("pydub") is not None
+
+# Path is immutable, so one instance can be shared as the dataclass default
+DEFAULT_OUTPUT_DIR = Path("storage/recordings")
+
+# Extensions stripped from caller-supplied filenames before the configured one is added
+AUDIO_EXTENSIONS = frozenset(('.wav', '.m4a', '.mp4'))
 
 try:
     import pyaudiowpatch as pyaudio
@@ -91,21 +94,23 @@ class RecordingQuality:
         'size_per_min': '22 MB/min'
     }
 
+    # Name -> preset lookup, built once at class creation
+    _PRESETS = {
+        'quick': QUICK,
+        'standard': STANDARD,
+        'professional': PROFESSIONAL,
+        'high': HIGH
+    }
+
     @classmethod
     def get_all(cls) -> Dict[str, Dict]:
         """Get all quality presets"""
-        return {
-            'quick': cls.QUICK,
-            'standard': cls.STANDARD,
-            'professional': cls.PROFESSIONAL,
-            'high': cls.HIGH
-        }
+        return dict(cls._PRESETS)
 
     @classmethod
     def get(cls, quality_name: str) -> Dict:
         """Get specific quality preset by name"""
-        qualities = cls.get_all()
-        return qualities.get(quality_name.lower(), cls.PROFESSIONAL)
+        return cls._PRESETS.get(quality_name.lower(), cls.PROFESSIONAL)
 
 
 @dataclass
@@ -129,7 +134,7 @@ class RecordingConfig:
     chunk_size: int = 4096    # Larger buffer for smoother recording
     format: int = pyaudio.paInt16 if PYAUDIO_AVAILABLE else None
     max_duration: Optional[int] = None
-    output_dir: Path = field(default_factory=lambda: Path("storage/recordings"))
+    output_dir: Path = DEFAULT_OUTPUT_DIR
     audio_format: str = "wav"  # 'wav' or 'm4a'
 
 
@@ -194,6 +199,7 @@ class AudioRecorder:
         self._recording_thread = None
         self._frames = []
         self._stats = None
+        self._start_monotonic = 0.0  # Monotonic start stamp for duration math
         self._progress_callback = None
         self._frames_captured = 0
         self._has_audio_detected = False
@@ -223,7 +229,7 @@ class AudioRecorder:
             bool: True if successfully configured a device
         """
         try:
-            with DeviceManager() as dm:
+            with DeviceManager(self._audio) as dm:  # Reuse this recorder's PyAudio
                 # Use specific function for devices capable of recording
                 recording_devices = dm.get_recording_capable_devices()
 
@@ -299,10 +305,9 @@ class AudioRecorder:
         expected_ext = f".{audio_format}"
 
         # Remove old extension if exists
-        for ext in ['.wav', '.m4a', '.mp4']:
-            if filename.endswith(ext):
-                filename = filename[:-len(ext)]
-                break
+        suffix = Path(filename).suffix
+        if suffix in AUDIO_EXTENSIONS:
+            filename = filename[:-len(suffix)]
 
         # Add correct extension
         if not filename.endswith(expected_ext):
@@ -316,6 +321,7 @@ class AudioRecorder:
         self._progress_callback = progress_callback
 
         # Initialize statistics
+        self._start_monotonic = time.monotonic()
         self._stats = RecordingStats(
             start_time=datetime.now(),
             filename=str(filepath)
@@ -361,7 +367,8 @@ class AudioRecorder:
             self._cleanup_recording()
             raise AudioRecorderError(f"Failed to start recording: {e}") from e
 
-    def _calculate_audio_level(self, data: bytes) -> float:
+    @staticmethod
+    def _calculate_audio_level(data: bytes) -> float:
         """
         Calculate the RMS (Root Mean Square) level of audio.
 
@@ -371,8 +378,15 @@ class AudioRecorder:
         Returns:
             float: RMS level of the audio
         """
-        import struct
         try:
+            if NUMPY_AVAILABLE:
+                # Zero-copy view over the buffer instead of a tuple of Python ints
+                samples = np.frombuffer(data, dtype='<i2', count=len(data) // 2)
+                if samples.size == 0:
+                    return 0.0
+                as_float = samples.astype(np.float32)
+                return float(np.sqrt(np.dot(as_float, as_float) / samples.size))
+
             # Convert bytes to list of samples (Int16)
             samples = struct.unpack(f'<{len(data)//2}h', data)
 
@@ -393,11 +407,11 @@ class AudioRecorder:
         logger.debug("Recording thread started")
 
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
 
             while self._recording:
                 # Check duration limit
-                current_time = time.time()
+                current_time = time.monotonic()
                 duration = current_time - start_time
 
                 if (self._config.max_duration and
@@ -444,8 +458,7 @@ class AudioRecorder:
                         except Exception as e:
                             logger.warning(f"Error in progress callback: {e}")
 
-                    # Small pause to avoid 100% CPU usage
-                    time.sleep(0.05)  # More pause time to reduce load
+                    # No extra pause: stream.read() already blocks until a full chunk is captured
 
                 except Exception as e:
                     logger.warning(f"Error reading audio data: {e}")
@@ -499,7 +512,7 @@ class AudioRecorder:
 
         # Finalize statistics
         self._stats.end_time = datetime.now()
-        self._stats.duration = (self._stats.end_time - self._stats.start_time).total_seconds()
+        self._stats.duration = time.monotonic() - self._start_monotonic
 
         # Save file
         try:
@@ -554,7 +567,10 @@ class AudioRecorder:
             wav_file.setnchannels(self._config.channels)
             wav_file.setsampwidth(self._audio.get_sample_size(self._config.format))
             wav_file.setframerate(self._config.sample_rate)
-            wav_file.writeframes(b''.join(self._frames))
+            # Write chunk by chunk instead of joining the whole recording into one
+            # bytes object (a second full copy of the audio in memory)
+            for frame in self._frames:
+                wav_file.writeframesraw(frame)
 
         logger.debug(f"WAV file saved: {self._stats.filename}")
 
@@ -571,6 +587,17 @@ class AudioRecorder:
                 "pydub not available for M4A encoding. Install with: pip install pydub"
             )
 
+        # find_spec only locates pydub; importing it can still fail (e.g. a broken
+        # audioop/pyaudioop). Keep the recording rather than lose it after the fact.
+        try:
+            from pydub import AudioSegment
+        except ImportError as e:
+            wav_filename = str(Path(self._stats.filename).with_suffix('.wav'))
+            logger.warning(f"pydub failed to import ({e}); saving {wav_filename} as WAV instead")
+            self._stats.filename = wav_filename
+            self._save_as_wav()
+            return
+
         try:
             logger.debug(f"Starting M4A encoding with pydub for {self._stats.filename}")
             logger.debug(f"Configuration: {self._config.channels} channels, {self._config.sample_rate}Hz, {len(self._frames)} frames")
@@ -680,8 +707,7 @@ class AudioRecorder:
 
         # Update current duration if recording
         if self._recording:
-            current_time = datetime.now()
-            self._stats.duration = (current_time - self._stats.start_time).total_seconds()
+            self._stats.duration = time.monotonic() - self._start_monotonic
 
         return self._stats
 
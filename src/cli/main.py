@@ -10,7 +10,41 @@ import time
 import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple, Any
+
+BYTES_PER_MB = 1 << 20  # Divisor for MB size reporting
+SUPPORTED_FORMATS = frozenset(("wav", "m4a"))  # Output formats accepted by quick_record
+
+# Positional argument schema per command: (name, type, default)
+_ARG_SCHEMAS = {
+    "record": (("duration", int, 30), ("audio_format", str, "wav")),
+}
+
+
+def _parse_args(schema: Tuple[Tuple[str, type, Any], ...], argv: list) -> list:
+    """
+    Parse positional arguments against a command schema in a single pass.
+
+    Args:
+        schema: Tuple of (name, type, default) entries
+        argv: Raw positional arguments following the command name
+
+    Returns:
+        list: Typed values in schema order (defaults for missing arguments)
+
+    Raises:
+        ValueError: If an argument cannot be converted to its declared type
+    """
+    values = []
+    for position, (name, cast, default) in enumerate(schema):
+        if position >= len(argv):
+            values.append(default)
+            continue
+        try:
+            values.append(cast(argv[position]))
+        except ValueError:
+            raise ValueError(f"Invalid {name}: {argv[position]!r}") from None
+    return values
 
 
 def quick_record(duration: int = 30, filename: Optional[str] = None, audio_format: str = "wav") -> dict:
@@ -30,7 +64,6 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
     # Lazy import - only load when actually recording
     from loguru import logger
     from config import settings
-    from audio import DualStreamRecorder, DualStreamRecorderError, RecordingQuality
 
     logger.debug(f"========================================")
     logger.debug(f"quick_record() called with:")
@@ -43,8 +76,9 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
     local_now = datetime.now().astimezone()
     timestamp = local_now.strftime("%Y%m%d_%H%M%S")
     session_id = f"rec-{timestamp}"
+    audio_format = audio_format.lower()
     if not filename:
-        ext = audio_format.lower() if audio_format.lower() in ['wav', 'm4a'] else 'wav'
+        ext = audio_format if audio_format in SUPPORTED_FORMATS else 'wav'
         filename = f"recording_{timestamp}.{ext}"
         logger.debug(f"Generated filename: {filename} (format: {audio_format})")
 
@@ -69,7 +103,20 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
     # Start recording in background thread
     def record_worker():
         """Background worker for dual-stream recording with status updates"""
-        start_time = time.time()
+        # The audio stack (PyAudio, NumPy) is loaded here so the JSON response
+        # is returned before its import cost is paid
+        try:
+            from audio import DualStreamRecorder, DualStreamRecorderError, RecordingQuality
+        except ImportError as e:
+            logger.error(f"Audio module unavailable: {e}")
+            status_file.write_text(json.dumps({
+                "status": "error",
+                "session_id": session_id,
+                "error": f"Audio module unavailable: {str(e)}"
+            }))
+            return
+
+        start_time = time.monotonic()
 
         try:
             recorder = DualStreamRecorder()
@@ -93,7 +140,7 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
 
             # Configure duration and format
             recorder._config.max_duration = max_duration
-            recorder._config.audio_format = audio_format.lower()
+            recorder._config.audio_format = audio_format
 
             # Get device names for logging
             speaker_name, mic_name = recorder.get_device_names()
@@ -123,13 +170,11 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
                 mic_warning = "Microphone failed to open - recording speaker only"
                 logger.warning(mic_warning)
 
-            status_file.write_text(json.dumps({
-                "status": "recording",
+            # Fields that stay constant for the whole session - built once and
+            # merged into every status write instead of being rebuilt per tick
+            session_info = {
                 "session_id": session_id,
                 "filename": filename,
-                "duration": initial_display_duration,
-                "elapsed": 0,
-                "progress": 0,
                 "quality": "professional",
                 "quality_info": {
                     "name": quality_preset['name'],
@@ -140,28 +185,44 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
                 "speaker_device": speaker_device,
                 "microphone_device": mic_device,
                 "dual_recording": mic_device is not None,
-                "mic_warning": mic_warning,
                 "sample_rate": recorder.get_sample_rate(),
                 "channels": recorder.get_channels(),
+            }
+
+            status_file.write_text(json.dumps({
+                "status": "recording",
+                **session_info,
+                "duration": initial_display_duration,
+                "elapsed": 0,
+                "progress": 0,
+                "mic_warning": mic_warning,
                 "frames_captured": 0,
                 "has_audio": False
             }))
 
-            # Update status every second
+            # Stop signal file (for manual mode or graceful shutdown)
+            # Frontend writes signals to storage/signals/, not storage/status/
+            stop_signal_file = Path(settings.storage_dir) / "signals" / f"{session_id}.stop"
+
+            # Update status every second, sleeping until absolute tick deadlines so the
+            # time spent polling and writing status does not accumulate as drift
+            tick_origin = time.monotonic()
             for i in range(effective_duration):
-                time.sleep(1)
-                elapsed = int(time.time() - start_time)
-
-                # Check for stop signal file (for manual mode or graceful shutdown)
-                # Frontend writes signals to storage/signals/, not storage/status/
-                signals_dir = Path(settings.storage_dir) / "signals"
-                stop_signal_file = signals_dir / f"{session_id}.stop"
-                if stop_signal_file.exists():
+                time.sleep(max(0.0, tick_origin + i + 1 - time.monotonic()))
+                elapsed = int(time.monotonic() - start_time)
+
+                # Check for stop signal file
+                # Consume the signal file directly instead of exists() + unlink()
+                try:
+                    stop_signal_file.unlink()
+                    stop_requested = True
+                except FileNotFoundError:
+                    stop_requested = False
+                except OSError as e:
+                    logger.warning(f"Could not delete stop signal file: {e}")
+                    stop_requested = True
+                if stop_requested:
                     logger.info(f"Stop signal received for session {session_id}")
-                    try:
-                        stop_signal_file.unlink()  # Clean up signal file
-                    except Exception as e:
-                        logger.warning(f"Could not delete stop signal file: {e}")
                     break
 
                 # Calculate progress based on mode
@@ -169,64 +230,37 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
                     progress = 0  # Manual mode doesn't show percentage
                     display_duration = 0  # Indicate no time limit
                 else:
-                    progress = min(100, int((elapsed / duration) * 100))
+                    # Integer percentage: no float round-trip (29/100*100 -> 28.999...)
+                    progress = min(100, elapsed * 100 // duration)
                     display_duration = duration
 
                 status_file.write_text(json.dumps({
                     "status": "recording",
-                    "session_id": session_id,
-                    "filename": filename,
+                    **session_info,
                     "duration": display_duration,
                     "elapsed": elapsed,
                     "progress": progress,
-                    "quality": "professional",
-                    "quality_info": {
-                        "name": quality_preset['name'],
-                        "description": quality_preset['description'],
-                        "size_per_min": quality_preset['size_per_min']
-                    },
-                    "device": speaker_device,
-                    "speaker_device": speaker_device,
-                    "microphone_device": mic_device,
-                    "dual_recording": mic_device is not None,
                     "mic_warning": mic_warning,
-                    "sample_rate": recorder.get_sample_rate(),
-                    "channels": recorder.get_channels(),
                     "frames_captured": recorder.get_frames_captured(),
                     "has_audio": recorder.has_audio_detected()
                 }))
 
             # Stop recording
-            recorder.stop_recording()
+            # stop_recording() writes the file synchronously and already
+            # stats it, so reuse that size instead of re-reading the disk
+            stats = recorder.stop_recording()
             logger.info(f"Recording completed: {filepath}")
 
             recorder.close()
 
-            # Wait a moment for file to be fully written
-            time.sleep(1)
-
-            # Get file size
-            file_size_mb = round(filepath.stat().st_size / (1024 * 1024), 2) if filepath.exists() else 0
+            file_size_mb = round(stats.file_size / BYTES_PER_MB, 2)
 
             # Write completion status with all metadata
             status_file.write_text(json.dumps({
                 "status": "completed",
-                "session_id": session_id,
-                "filename": filename,
+                **session_info,
                 "duration": duration,
                 "file_size_mb": file_size_mb,
-                "quality": "professional",
-                "quality_info": {
-                    "name": quality_preset['name'],
-                    "description": quality_preset['description'],
-                    "size_per_min": quality_preset['size_per_min']
-                },
-                "device": speaker_device,
-                "speaker_device": speaker_device,
-                "microphone_device": mic_device,
-                "dual_recording": mic_device is not None,
-                "sample_rate": recorder.get_sample_rate(),
-                "channels": recorder.get_channels(),
                 "frames_captured": recorder.get_frames_captured(),
                 "has_audio": recorder.has_audio_detected()
             }))
@@ -255,57 +289,69 @@ def quick_record(duration: int = 30, filename: Optional[str] = None, audio_forma
     return result, thread
 
 
-def main():
-    """Main CLI entry point"""
+def _cmd_record(argv: list) -> None:
+    """Quick record mode - return JSON IMMEDIATELY before logging setup"""
+    try:
+        duration, audio_format = _parse_args(_ARG_SCHEMAS["record"], argv)
+    except ValueError as e:
+        print(json.dumps({"status": "error", "message": str(e)}), flush=True)
+        return
 
-    # Check if called with arguments (Raycast integration)
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
+    result, thread = quick_record(duration=duration, audio_format=audio_format)
+    print(json.dumps(result), flush=True)
 
-        if command == "record":
-            # Quick record mode - return JSON IMMEDIATELY before logging setup
-            duration = int(sys.argv[2]) if len(sys.argv) > 2 else 30
-            audio_format = sys.argv[3] if len(sys.argv) > 3 else "wav"
+    # Wait for recording to complete (in background)
+    thread.join()
 
-            result, thread = quick_record(duration=duration, audio_format=audio_format)
-            print(json.dumps(result), flush=True)
 
-            # Wait for recording to complete (in background)
-            thread.join()
-            return
+def _cmd_status(argv: list) -> None:
+    """System status check - lazy import"""
+    from audio import DeviceManager
+
+    try:
+        dm = DeviceManager()
+        devices = dm.list_all_devices()
 
-        elif command == "status":
-            # System status check - lazy import
-            from audio import DeviceManager
-
-            try:
-                dm = DeviceManager()
-                devices = dm.list_all_devices()
-
-                result = {
-                    "status": "success",
-                    "data": {
-                        "devices_count": len(devices),
-                        "devices": [
-                            {
-                                "name": d.name,
-                                "is_loopback": d.is_loopback,
-                                "channels": d.max_input_channels
-                            }
-                            for d in devices
-                        ]
+        result = {
+            "status": "success",
+            "data": {
+                "devices_count": len(devices),
+                "devices": [
+                    {
+                        "name": d.name,
+                        "is_loopback": d.is_loopback,
+                        "channels": d.max_input_channels
                     }
-                }
-                print(json.dumps(result), flush=True)
-                return
+                    for d in devices
+                ]
+            }
+        }
+        print(json.dumps(result), flush=True)
 
-            except Exception as e:
-                result = {
-                    "status": "error",
-                    "message": str(e)
-                }
-                print(json.dumps(result), flush=True)
-                return
+    except Exception as e:
+        result = {
+            "status": "error",
+            "message": str(e)
+        }
+        print(json.dumps(result), flush=True)
+
+
+# Raycast command dispatch table (command name -> handler taking the remaining argv)
+_COMMANDS = {
+    "record": _cmd_record,
+    "status": _cmd_status,
+}
+
+
+def main():
+    """Main CLI entry point"""
+
+    # Check if called with arguments (Raycast integration)
+    if len(sys.argv) > 1:
+        handler = _COMMANDS.get(sys.argv[1])
+        if handler is not None:
+            handler(sys.argv[2:])
+            return
 
     # Interactive mode - only initialize logging if running interactively
     from loguru import logger
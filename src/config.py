@@ -1,7 +1,7 @@
 from pathlib import Path
 from typing import Optional
 import os
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from loguru import logger
 from dotenv import load_dotenv
 
@@ -31,12 +31,11 @@ class Settings(BaseSettings):
     default_recording_duration: int = 300  # 5 minutes default
     max_recording_duration: int = 7200     # 2 hours max
 
-    model_config = {"env_file": ".env", "case_sensitive": False}
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
 def setup_directories():
     """Create required directories for MeetingScribe"""
-    settings = Settings()
-
+    # Reuse the already-validated module instance instead of re-reading env/.env
     directories = [
         settings.storage_dir,
         settings.logs_dir,
@@ -49,8 +48,6 @@ def setup_directories():
         logger.debug(f"Directory ready: {directory}")
 
 def setup_logging():
-    settings = Settings()
-    
     logger.remove()
     logger.add(
         settings.logs_dir / "meetingscribe.log",
@@ -5,7 +5,6 @@ Detecta reuniões ativas e inicia gravação automaticamente
 
 import time
 import psutil
-import wmi
 from datetime import datetime
 from pathlib import Path
 from loguru import logger
@@ -20,6 +19,11 @@ class TeamsIntegration:
     Monitora Microsoft Teams e automatiza gravações durante reuniões
     """
     
+    # Termos (minúsculos) avaliados em cada janela visível durante o EnumWindows;
+    # 'microsoft teams' já é coberto por 'teams'
+    TEAMS_WINDOW_TERMS = ('meeting', 'teams')
+    MEETING_WINDOW_KEYWORDS = ('meeting', 'call', 'reunião', 'chamada', '|')
+    
     def __init__(self):
         self.is_monitoring = False
         self.current_meeting = None
@@ -31,6 +35,16 @@ class TeamsIntegration:
         # Configurações
         self.check_interval = 5  # segundos
         self.auto_start_delay = 3  # segundos após detectar reunião
+        self.meeting_check_ttl = 1.0  # segundos de reuso da última detecção
+        
+        # (instante monotônico, resultado) da última chamada a is_in_meeting
+        self._last_meeting_check = (float('-inf'), None)
+        
+        # pid -> psutil.Process dos processos do Teams (base para cpu_percent não bloqueante)
+        self._teams_procs = {}
+        
+        # Sinaliza parada: as esperas do loop acordam na hora em vez de dormir o intervalo todo
+        self._stop_event = threading.Event()
         
         logger.info("Teams Integration inicializado")
     
@@ -55,7 +69,12 @@ class TeamsIntegration:
             teams_processes = []
             for process in psutil.process_iter(['pid', 'name', 'cmdline']):
                 if process.info['name'] and 'teams' in process.info['name'].lower():
-                    teams_processes.append(process)
+                    # Reusar o mesmo objeto Process entre verificações: cpu_percent(None)
+                    # mede o uso desde a chamada anterior nesse objeto
+                    teams_processes.append(self._teams_procs.get(process.pid, process))
+            
+            # Manter no cache apenas processos do Teams ainda vivos
+            self._teams_procs = {process.pid: process for process in teams_processes}
             
             if not teams_processes:
                 return None
@@ -65,17 +84,19 @@ class TeamsIntegration:
                 import win32gui
                 import win32process
                 
+                teams_terms = self.TEAMS_WINDOW_TERMS
+                meeting_keywords = self.MEETING_WINDOW_KEYWORDS
+                
                 def enum_windows_callback(hwnd, windows):
                     if win32gui.IsWindowVisible(hwnd):
                         window_title = win32gui.GetWindowText(hwnd)
-                        if window_title and ('meeting' in window_title.lower() or 
-                                           'teams' in window_title.lower() or
-                                           'microsoft teams' in window_title.lower()):
+                        if not window_title:
+                            return
+                        title_lower = window_title.lower()
+                        if any(term in title_lower for term in teams_terms):
                             
                             # Verificar se é uma janela de reunião ativa
-                            if any(keyword in window_title.lower() for keyword in [
-                                'meeting', 'call', 'reunião', 'chamada', '|'
-                            ]):
+                            if any(keyword in title_lower for keyword in meeting_keywords):
                                 windows.append({
                                     'title': window_title,
                                     'hwnd': hwnd
@@ -100,7 +121,8 @@ class TeamsIntegration:
             # Método 3: Verificar uso de CPU/Rede do Teams (indicador de chamada ativa)
             for process in teams_processes:
                 try:
-                    cpu_percent = process.cpu_percent(interval=1)
+                    # Não bloqueante: a primeira leitura de um processo novo retorna 0.0
+                    cpu_percent = process.cpu_percent(interval=None)
                     if cpu_percent > 5:  # Teams usando CPU = provável reunião
                         return {
                             'detected': True,
@@ -117,6 +139,24 @@ class TeamsIntegration:
             logger.error(f"Erro ao detectar reunião: {e}")
             return None
     
+    def _check_meeting(self) -> dict:
+        """
+        Executa is_in_meeting e guarda o resultado para reuso
+        """
+        meeting_info = self.is_in_meeting()
+        self._last_meeting_check = (time.monotonic(), meeting_info)
+        return meeting_info
+    
+    def _cached_meeting_info(self) -> dict:
+        """
+        Retorna a última detecção se tiver menos de meeting_check_ttl segundos,
+        evitando repetir a varredura de processos/janelas em consultas de status
+        """
+        checked_at, meeting_info = self._last_meeting_check
+        if time.monotonic() - checked_at <= self.meeting_check_ttl:
+            return meeting_info
+        return self._check_meeting()
+    
     def get_active_audio_devices(self) -> dict:
         """
         Obtém os dispositivos de áudio ativos no Windows
@@ -262,11 +302,11 @@ class TeamsIntegration:
                         logger.info("Teams fechado - parando gravação")
                         self.stop_auto_recording()
                     
-                    time.sleep(self.check_interval)
+                    self._stop_event.wait(self.check_interval)
                     continue
                 
                 # Verificar se está em reunião
-                meeting_info = self.is_in_meeting()
+                meeting_info = self._check_meeting()
                 in_meeting = meeting_info is not None
                 
                 # Estado mudou para "em reunião"
@@ -274,7 +314,8 @@ class TeamsIntegration:
                     logger.info(f"Reunião detectada: {meeting_info['title']}")
                     
                     # Aguardar alguns segundos e verificar novamente
-                    time.sleep(self.auto_start_delay)
+                    if self._stop_event.wait(self.auto_start_delay):
+                        break
                     
                     # Verificar se ainda está em reunião
                     if self.is_in_meeting():
@@ -287,11 +328,11 @@ class TeamsIntegration:
                         self.stop_auto_recording()
                 
                 last_meeting_state = in_meeting
-                time.sleep(self.check_interval)
+                self._stop_event.wait(self.check_interval)
                 
             except Exception as e:
                 logger.error(f"Erro no loop de monitoramento: {e}")
-                time.sleep(self.check_interval)
+                self._stop_event.wait(self.check_interval)
     
     def start_monitoring(self):
         """
@@ -302,6 +343,7 @@ class TeamsIntegration:
             return False
         
         self.is_monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
         self.monitor_thread.start()
         
@@ -317,6 +359,7 @@ class TeamsIntegration:
         
         logger.info("Parando monitoramento...")
         self.is_monitoring = False
+        self._stop_event.set()
         
         # Parar gravação ativa se houver
         if self.recording_active:
@@ -345,7 +388,7 @@ class TeamsIntegration:
         return {
             'monitoring_active': self.is_monitoring,
             'teams_running': self.is_teams_running(),
-            'in_meeting': self.is_in_meeting() is not None,
+            'in_meeting': self._cached_meeting_info() is not None,
             'recording_active': self.recording_active,
             'current_meeting': self.current_meeting
         }
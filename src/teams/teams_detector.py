@@ -10,6 +10,7 @@ Supports both Teams app and browser-based Teams meetings.
 
 from __future__ import annotations
 
+import re
 import time
 import psutil
 import threading
@@ -38,6 +39,10 @@ class MeetingState(Enum):
 @dataclass
 class MeetingDetection:
     """Information about detected Teams meeting"""
+    # Explicit slots (dataclass(slots=True) needs Python 3.10): no per-instance __dict__
+    __slots__ = ("process_name", "window_title", "pid", "audio_active",
+                 "detection_time", "confidence")
+
     process_name: str
     window_title: str
     pid: int
@@ -49,37 +54,64 @@ class MeetingDetection:
 class TeamsDetector:
     """Monitors system for Teams meeting activity"""
     
-    def __init__(self, poll_interval: float = 2.0):
+    def __init__(self, poll_interval: float = 2.0, max_poll_interval: float = 30.0):
         self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
         self.state = MeetingState.IDLE
         self.current_detection: Optional[MeetingDetection] = None
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        # Idle backoff: consecutive IDLE ticks with no Teams/browser process running
+        self._idle_ticks = 0
+        self._candidates_present = False
+        
+        # pid -> psutil.Process reused across ticks so cpu_percent(None) can measure
+        # usage since the previous tick instead of blocking for a sample window
+        self._proc_cache: Dict[int, psutil.Process] = {}
         
         # Callbacks
         self.on_meeting_detected: Optional[Callable[[MeetingDetection], None]] = None
         self.on_meeting_ended: Optional[Callable[[MeetingDetection], None]] = None
         self.on_state_changed: Optional[Callable[[MeetingState, MeetingState], None]] = None
         
-        # Detection patterns
-        self.teams_process_names = {
+        # Detection patterns (frozen: matched against every process/window each tick)
+        self.teams_process_names = frozenset({
             "Teams.exe",
             "ms-teams.exe", 
             "Teams_webkit2gtk.exe"
-        }
+        })
         
-        self.teams_window_patterns = {
+        self.teams_window_patterns = frozenset({
             "Microsoft Teams",
             "Teams Meeting",
             "Meeting -",
             "Call -"
-        }
+        })
         
-        self.browser_meeting_patterns = {
+        self.browser_meeting_patterns = frozenset({
             "Teams - Microsoft",
             "Meeting | Microsoft Teams",
             "Teams meeting"
-        }
+        })
+        
+        self.browser_process_names = frozenset({
+            "chrome.exe", "msedge.exe", "firefox.exe", 
+            "brave.exe", "opera.exe", "vivaldi.exe"
+        })
+        
+        # Each pattern set compiled into one alternation: a single C-level scan per title
+        self._teams_title_re = self._compile_patterns(self.teams_window_patterns)
+        self._browser_title_re = self._compile_patterns(self.browser_meeting_patterns)
+        self._any_meeting_re = self._compile_patterns(
+            self.teams_window_patterns | self.browser_meeting_patterns
+        )
+
+    @staticmethod
+    def _compile_patterns(patterns: frozenset) -> re.Pattern:
+        """Compile literal substrings into a single search regex"""
+        return re.compile('|'.join(re.escape(pattern) for pattern in sorted(patterns)))
 
     def start_monitoring(self) -> bool:
         """Start background monitoring thread"""
@@ -89,7 +121,18 @@ class TeamsDetector:
         if not HAS_WIN32:
             logger.warning("Win32 libraries not available, Teams detection limited")
             
+        # A previous loop whose stop timed out is still running: it must exit
+        # before the stop event is cleared, or it would keep polling alongside
+        # the new thread
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5.0)
+            if self._thread.is_alive():
+                logger.warning("Previous Teams detection thread still running, not restarting")
+                return False
+            
         self._running = True
+        self._stop_event.clear()
+        self._idle_ticks = 0
         self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._thread.start()
         logger.info("Teams detection monitoring started")
@@ -98,6 +141,7 @@ class TeamsDetector:
     def stop_monitoring(self) -> None:
         """Stop background monitoring"""
         self._running = False
+        self._stop_event.set()  # Wake the loop out of its poll wait
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
         logger.info("Teams detection monitoring stopped")
@@ -123,45 +167,90 @@ class TeamsDetector:
             except Exception as e:
                 logger.error(f"Error in Teams detection loop: {e}")
                 
-            time.sleep(self.poll_interval)
+            if self._stop_event.wait(self._next_poll_interval()):
+                break
+
+    def _next_poll_interval(self) -> float:
+        """Back off exponentially while idle with no Teams/browser process running"""
+        if self.state == MeetingState.IDLE and not self._candidates_present:
+            self._idle_ticks += 1
+        else:
+            self._idle_ticks = 0
+        return min(self.max_poll_interval,
+                   self.poll_interval * (1.5 ** min(self._idle_ticks, 8)))
 
     def _detect_teams_meeting(self) -> Optional[MeetingDetection]:
         """Detect if Teams meeting is currently active"""
         
+        # One process table walk per tick, classified into Teams and browser candidates
+        teams_names = self.teams_process_names
+        browser_names = self.browser_process_names
+        teams_processes = []
+        browser_processes = []
+        for proc_info in self._snapshot_processes():
+            name = proc_info['name']
+            if name in teams_names:
+                teams_processes.append(proc_info)
+            elif name in browser_names:
+                browser_processes.append(proc_info)
+        
+        candidate_pids = {proc_info['pid'] for proc_info in teams_processes}
+        candidate_pids.update(proc_info['pid'] for proc_info in browser_processes)
+        self._candidates_present = bool(candidate_pids)
+        
+        # Drop cached Process objects for candidates that have exited
+        for pid in self._proc_cache.keys() - candidate_pids:
+            del self._proc_cache[pid]
+        
+        # Nothing Teams-like running: skip window enumeration entirely
+        if not candidate_pids:
+            return None
+        
+        # One EnumWindows pass per tick, shared by every candidate PID
+        pid_titles = self._build_pid_title_map(candidate_pids)
+        
         # Method 1: Direct Teams process detection
-        teams_detection = self._detect_teams_process()
+        teams_detection = self._detect_teams_process(teams_processes, pid_titles)
         if teams_detection:
             return teams_detection
             
         # Method 2: Browser-based Teams detection
-        browser_detection = self._detect_browser_teams()
+        browser_detection = self._detect_browser_teams(browser_processes, pid_titles)
         if browser_detection:
             return browser_detection
             
         return None
 
-    def _detect_teams_process(self) -> Optional[MeetingDetection]:
+    def _snapshot_processes(self) -> list[Dict[str, Any]]:
+        """Get pid/name info for all running processes in a single walk"""
+        try:
+            return [proc.info for proc in psutil.process_iter(['pid', 'name'])]
+        except Exception as e:
+            logger.error(f"Error listing processes: {e}")
+            return []
+
+    def _detect_teams_process(self, teams_processes: list[Dict[str, Any]],
+                              pid_titles: Dict[int, list[str]]) -> Optional[MeetingDetection]:
         """Detect Teams via native app process"""
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            for proc_info in teams_processes:
                 try:
-                    if proc.info['name'] in self.teams_process_names:
-                        # Found Teams process, check if in meeting
-                        window_title = self._get_window_title_for_pid(proc.info['pid'])
+                    # Found Teams process, check if in meeting
+                    window_title = self._get_window_title_for_pid(proc_info['pid'], pid_titles)
+                    
+                    if self._is_meeting_window(window_title):
+                        audio_active = self._check_audio_activity(proc_info['pid'])
                         
-                        if self._is_meeting_window(window_title):
-                            audio_active = self._check_audio_activity(proc.info['pid'])
-                            
-                            confidence = 0.9 if audio_active else 0.7
-                            
-                            return MeetingDetection(
-                                process_name=proc.info['name'],
-                                window_title=window_title or "Teams",
-                                pid=proc.info['pid'],
-                                audio_active=audio_active,
-                                detection_time=time.time(),
-                                confidence=confidence
-                            )
+                        confidence = 0.9 if audio_active else 0.7
+                        
+                        return MeetingDetection(
+                            process_name=proc_info['name'],
+                            window_title=window_title or "Teams",
+                            pid=proc_info['pid'],
+                            audio_active=audio_active,
+                            detection_time=time.time(),
+                            confidence=confidence
+                        )
                             
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
@@ -171,16 +260,15 @@ class TeamsDetector:
             
         return None
 
-    def _detect_browser_teams(self) -> Optional[MeetingDetection]:
+    def _detect_browser_teams(self, browser_processes: list[Dict[str, Any]],
+                              pid_titles: Dict[int, list[str]]) -> Optional[MeetingDetection]:
         """Detect Teams meeting in browser"""
         if not HAS_WIN32:
             return None
             
         try:
-            browser_processes = self._get_browser_processes()
-            
             for proc_info in browser_processes:
-                window_title = self._get_window_title_for_pid(proc_info['pid'])
+                window_title = self._get_window_title_for_pid(proc_info['pid'], pid_titles)
                 
                 if self._is_browser_meeting_window(window_title):
                     audio_active = self._check_audio_activity(proc_info['pid'])
@@ -201,78 +289,73 @@ class TeamsDetector:
             
         return None
 
-    def _get_browser_processes(self) -> list[Dict[str, Any]]:
-        """Get list of browser processes"""
-        browser_names = {
-            "chrome.exe", "msedge.exe", "firefox.exe", 
-            "brave.exe", "opera.exe", "vivaldi.exe"
-        }
-        
-        browsers = []
-        try:
-            for proc in psutil.process_iter(['pid', 'name']):
-                if proc.info['name'] in browser_names:
-                    browsers.append(proc.info)
-        except Exception:
-            pass
-            
-        return browsers
-
-    def _get_window_title_for_pid(self, pid: int) -> Optional[str]:
-        """Get window title for given process ID"""
-        if not HAS_WIN32:
-            return None
+    def _build_pid_title_map(self, pids: set[int]) -> Dict[int, list[str]]:
+        """Map each of the given PIDs to its visible window titles (one EnumWindows call)"""
+        if not HAS_WIN32 or not pids:
+            return {}
             
         try:
-            def enum_windows_callback(hwnd, titles):
+            def enum_windows_callback(hwnd, pid_titles):
                 if win32gui.IsWindowVisible(hwnd):
                     _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                    if window_pid == pid:
+                    if window_pid in pids:
                         title = win32gui.GetWindowText(hwnd)
                         if title:
-                            titles.append(title)
+                            pid_titles.setdefault(window_pid, []).append(title)
                 return True
             
-            titles = []
-            win32gui.EnumWindows(enum_windows_callback, titles)
-            
-            # Return most relevant title
-            for title in titles:
-                if any(pattern in title for pattern in 
-                      self.teams_window_patterns.union(self.browser_meeting_patterns)):
-                    return title
-                    
-            return titles[0] if titles else None
+            pid_titles: Dict[int, list[str]] = {}
+            win32gui.EnumWindows(enum_windows_callback, pid_titles)
+            return pid_titles
             
         except Exception as e:
-            logger.debug(f"Could not get window title for PID {pid}: {e}")
+            logger.debug(f"Could not enumerate window titles: {e}")
+            return {}
+
+    def _get_window_title_for_pid(self, pid: int, pid_titles: Dict[int, list[str]]) -> Optional[str]:
+        """Get window title for given process ID from this tick's title map"""
+        titles = pid_titles.get(pid)
+        if not titles:
             return None
+            
+        # Return most relevant title
+        for title in titles:
+            if self._any_meeting_re.search(title):
+                return title
+                
+        return titles[0]
 
     def _is_meeting_window(self, window_title: Optional[str]) -> bool:
         """Check if window title indicates Teams meeting"""
         if not window_title:
             return False
             
-        return any(pattern in window_title for pattern in self.teams_window_patterns)
+        return self._teams_title_re.search(window_title) is not None
 
     def _is_browser_meeting_window(self, window_title: Optional[str]) -> bool:
         """Check if browser window title indicates Teams meeting"""
         if not window_title:
             return False
             
-        return any(pattern in window_title for pattern in self.browser_meeting_patterns)
+        return self._browser_title_re.search(window_title) is not None
 
     def _check_audio_activity(self, pid: int) -> bool:
         """Check if process has active audio streams"""
         try:
             # Simple heuristic: check if process has audio-related handles
             # More sophisticated implementation would use Windows Audio APIs
-            proc = psutil.Process(pid)
+            proc = self._proc_cache.get(pid)
+            if proc is None:
+                proc = self._proc_cache[pid] = psutil.Process(pid)
             
-            # Check CPU usage as proxy for audio processing
-            cpu_percent = proc.cpu_percent(interval=0.1)
+            # Check CPU usage as proxy for audio processing. Non-blocking: measured
+            # since the previous tick; the first reading for a new process is 0.0
+            cpu_percent = proc.cpu_percent(interval=None)
             return cpu_percent > 1.0  # Active processing threshold
             
+        except psutil.NoSuchProcess:
+            self._proc_cache.pop(pid, None)
+            return False
         except Exception:
             return False
 
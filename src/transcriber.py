@@ -1,8 +1,11 @@
 import google.generativeai as genai
+import io
 import os
 import time
 import json
+from math import gcd
 from pathlib import Path
+from typing import Optional, Union
 import soundfile as sf
 import numpy as np
 from scipy import signal
@@ -24,6 +27,12 @@ TARGET_CHANNELS = 1  # Mono (voice does not need stereo)
 # Timeout in seconds (adjust as needed)
 REQUEST_TIMEOUT = 300  # 5 minutes
 
+BYTES_PER_MB = 1 << 20  # Divisor for MB size reporting
+DECODE_BLOCK_FRAMES = 1 << 16  # Frames decoded per block when streaming a downmix
+
+# Status directories already created this run (write_status is called once per step)
+_ENSURED_STATUS_DIRS = set()
+
 # --------------------
 
 def write_status(status_file_path, step: int, total_steps: int, step_name: str, message: str = ""):
@@ -32,7 +41,7 @@ def write_status(status_file_path, step: int, total_steps: int, step_name: str,
         return
 
     try:
-        progress = int((step / total_steps) * 100)
+        progress = step * 100 // total_steps
         status_data = {
             "step": step_name,
             "step_number": step,
@@ -40,14 +49,34 @@ def write_status(status_file_path, step: int, total_steps: int, step_name: str,
             "progress": progress,
             "message": message,
         }
-        Path(status_file_path).parent.mkdir(parents=True, exist_ok=True)
-        Path(status_file_path).write_text(json.dumps(status_data), encoding="utf-8")
+        status_path = Path(status_file_path)
+        status_dir = status_path.parent
+        payload = json.dumps(status_data)
+        if status_dir not in _ENSURED_STATUS_DIRS:
+            status_dir.mkdir(parents=True, exist_ok=True)
+            _ENSURED_STATUS_DIRS.add(status_dir)
+        try:
+            status_path.write_text(payload, encoding="utf-8")
+        except FileNotFoundError:
+            # Directory was removed mid-run: recreate it instead of trusting the cache
+            status_dir.mkdir(parents=True, exist_ok=True)
+            status_path.write_text(payload, encoding="utf-8")
     except Exception as e:
         # Log error for debugging purposes
         print(f"[Status] Error writing status file to {status_file_path}: {e}", file=__import__('sys').stderr)
 
 
-def optimize_audio(input_path: str) -> tuple[str, float]:
+def downmix_mono(audio_data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Average a (frames, channels) float array down to mono without a float64 temporary."""
+    if audio_data.shape[1] == 2:
+        # Common stereo case: one add into the output buffer, then scale it in place
+        mono = np.add(audio_data[:, 0], audio_data[:, 1], out=out, dtype=np.float32)
+        mono *= 0.5
+        return mono
+    return np.mean(audio_data, axis=1, dtype=np.float32, out=out)
+
+
+def optimize_audio(input_path: str, original_size: Optional[float] = None) -> tuple[Union[str, io.BytesIO], float]:
     """
     Converts and optimizes audio file to reduce size while maintaining quality.
 
@@ -56,17 +85,44 @@ def optimize_audio(input_path: str) -> tuple[str, float]:
     - Reduction to 16kHz (sufficient for human voice)
     - WAV format (compatible and lossless)
 
+    Args:
+        input_path: Path to the audio file
+        original_size: Input size in MB if the caller already has it (skips a stat call)
+
     Returns:
-        tuple: (path to optimized file, size in MB)
+        tuple: (in-memory optimized WAV, or the original path if already optimal, size in MB)
     """
     print(f"[Optimization] Loading original file...")
 
     file_path = Path(input_path)
-    original_size = file_path.stat().st_size / (1024 * 1024)
+    if original_size is None:
+        original_size = file_path.stat().st_size / BYTES_PER_MB
 
     try:
+        # Read only the header first: a file already in the target format
+        # does not need to be decoded and re-encoded
+        info = sf.info(str(file_path))
+        if (info.samplerate == TARGET_SAMPLE_RATE and info.channels == TARGET_CHANNELS
+                and info.format == 'WAV' and info.subtype == 'PCM_16'):
+            print(f"[Optimization] Already {TARGET_SAMPLE_RATE}Hz, {TARGET_CHANNELS}ch PCM WAV - skipping")
+            return str(file_path), original_size
+
         # Try to read audio file with soundfile (WAV, FLAC, OGG)
-        audio_data, sample_rate = sf.read(str(file_path))
+        # Decode straight to float32: float64 precision is not needed for 16-bit output
+        sample_rate = info.samplerate
+        if info.channels > 1 and TARGET_CHANNELS == 1 and info.frames > 0:
+            # Decode block by block, downmixing into one preallocated mono buffer:
+            # peak memory is the mono signal plus one block, not the full multichannel array
+            audio_data = np.empty(info.frames, dtype=np.float32)
+            position = 0
+            for block in sf.blocks(str(file_path), blocksize=DECODE_BLOCK_FRAMES,
+                                   dtype='float32', always_2d=True):
+                end = position + len(block)
+                downmix_mono(block, out=audio_data[position:end])
+                position = end
+            audio_data = audio_data[:position]
+        else:
+            audio_data, sample_rate = sf.read(str(file_path), dtype='float32')
     except Exception as e:
         # If it fails, try with pydub (supports more formats, but requires ffmpeg)
         print(f"[Optimization] soundfile failed, trying pydub...")
@@ -84,57 +140,55 @@ def optimize_audio(input_path: str) -> tuple[str, float]:
             if audio_segment.frame_rate != TARGET_SAMPLE_RATE:
                 audio_segment = audio_segment.set_frame_rate(TARGET_SAMPLE_RATE)
 
-            # Save as temporary WAV
-            temp_path = file_path.parent / f"{file_path.stem}_optimized.wav"
-            audio_segment.export(str(temp_path), format="wav", parameters=["-ac", "1", "-ar", str(TARGET_SAMPLE_RATE)])
+            # Encode the WAV in memory: it is only needed for the upload
+            wav_buffer = io.BytesIO()
+            audio_segment.export(wav_buffer, format="wav", parameters=["-ac", "1", "-ar", str(TARGET_SAMPLE_RATE)])
 
-            optimized_size = temp_path.stat().st_size / (1024 * 1024)
+            optimized_size = wav_buffer.getbuffer().nbytes / BYTES_PER_MB
             reduction = ((original_size - optimized_size) / original_size) * 100
 
             print(f"[Optimization] Original: {audio_segment.frame_rate}Hz, {audio_segment.channels}ch, {original_size:.2f}MB")
             print(f"[Optimization] Optimized: {TARGET_SAMPLE_RATE}Hz, {TARGET_CHANNELS}ch, {optimized_size:.2f}MB")
             print(f"[Optimization] Reduction: {reduction:.1f}%")
 
-            return str(temp_path), optimized_size
+            wav_buffer.seek(0)
+            return wav_buffer, optimized_size
 
         except ImportError:
             raise Exception("pydub is not installed. Install with: pip install pydub")
         except Exception as pydub_error:
             raise Exception(f"Error processing audio with pydub (ffmpeg may be missing): {pydub_error}")
 
-    # Detect number of channels
-    if len(audio_data.shape) > 1:
-        channels = audio_data.shape[1]
-    else:
-        channels = 1
-
-    print(f"[Optimization] Original: {sample_rate}Hz, {channels}ch, {original_size:.2f}MB")
+    print(f"[Optimization] Original: {sample_rate}Hz, {info.channels}ch, {original_size:.2f}MB")
 
     # Convert to mono if necessary
     if len(audio_data.shape) > 1 and TARGET_CHANNELS == 1:
-        audio_data = np.mean(audio_data, axis=1)
+        audio_data = downmix_mono(audio_data)
 
     # Resample if necessary
     if sample_rate != TARGET_SAMPLE_RATE:
-        # Calculate number of samples at new rate
-        num_samples = int(len(audio_data) * TARGET_SAMPLE_RATE / sample_rate)
-        audio_data = signal.resample(audio_data, num_samples)
+        # Polyphase resampling by the reduced rate ratio (e.g. 48k -> 16k is 1/3):
+        # linear in file length, unlike a whole-file FFT resample
+        ratio_gcd = gcd(TARGET_SAMPLE_RATE, sample_rate)
+        audio_data = signal.resample_poly(audio_data, TARGET_SAMPLE_RATE // ratio_gcd,
+                                          sample_rate // ratio_gcd)
 
     # Normalize to 16-bit integer range
     audio_data = np.clip(audio_data, -1.0, 1.0)
     audio_data = (audio_data * 32767).astype(np.int16)
 
-    # Save as optimized WAV
-    temp_path = file_path.parent / f"{file_path.stem}_optimized.wav"
-    sf.write(str(temp_path), audio_data, TARGET_SAMPLE_RATE, subtype='PCM_16')
+    # Encode the optimized WAV in memory instead of a temporary file on disk
+    wav_buffer = io.BytesIO()
+    sf.write(wav_buffer, audio_data, TARGET_SAMPLE_RATE, format='WAV', subtype='PCM_16')
 
-    optimized_size = temp_path.stat().st_size / (1024 * 1024)
+    optimized_size = wav_buffer.getbuffer().nbytes / BYTES_PER_MB
     reduction = ((original_size - optimized_size) / original_size) * 100
 
     print(f"[Optimization] Optimized: {TARGET_SAMPLE_RATE}Hz, {TARGET_CHANNELS}ch, {optimized_size:.2f}MB")
     print(f"[Optimization] Reduction: {reduction:.1f}%")
 
-    return str(temp_path), optimized_size
+    wav_buffer.seek(0)
+    return wav_buffer, optimized_size
 
 def main():
     """Main function to execute transcription."""
@@ -164,26 +218,28 @@ def main():
     try:
         # Check file information before starting
         file_path = Path(AUDIO_FILE_PATH)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {AUDIO_FILE_PATH}")
+        try:
+            original_size_mb = file_path.stat().st_size / BYTES_PER_MB
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {AUDIO_FILE_PATH}") from None
 
-        original_size_mb = file_path.stat().st_size / (1024 * 1024)
         print(f"Original file: {file_path.name}")
         print(f"Size: {original_size_mb:.2f} MB")
         print(f"Format: {file_path.suffix}")
         print()
 
         # Optimize audio if configured
-        upload_file_path = AUDIO_FILE_PATH
-        optimized_file = None
+        upload_source = AUDIO_FILE_PATH
+        upload_name = file_path.name
 
         if OPTIMIZE_AUDIO:
             print("=" * 60)
             print("AUDIO OPTIMIZATION")
             print("=" * 60)
-            optimized_file, optimized_size = optimize_audio(AUDIO_FILE_PATH)
-            upload_file_path = optimized_file
-            print(f"\nFile to be sent: {Path(optimized_file).name}")
+            upload_source, optimized_size = optimize_audio(AUDIO_FILE_PATH, original_size_mb)
+            if isinstance(upload_source, io.BytesIO):
+                upload_name = f"{file_path.stem}_optimized.wav"
+            print(f"\nFile to be sent: {upload_name}")
             print(f"Final size: {optimized_size:.2f} MB")
             print("=" * 60)
             print()
@@ -195,14 +251,20 @@ def main():
         #    This is necessary so the model can "hear" the audio.
         write_status(STATUS_FILE, 1, 4, "uploading", "Uploading file to Gemini API...")
         print(f"[1/4] Uploading file...")
-        upload_start = time.time()
+        upload_start = time.perf_counter()
 
         # Try upload with retry
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                audio_file = genai.upload_file(path=upload_file_path)
-                upload_time = time.time() - upload_start
+                if isinstance(upload_source, io.BytesIO):
+                    # In-memory WAV: rewind for each attempt, MIME type cannot be guessed
+                    upload_source.seek(0)
+                    audio_file = genai.upload_file(path=upload_source, mime_type="audio/wav",
+                                                   display_name=upload_name)
+                else:
+                    audio_file = genai.upload_file(path=upload_source)
+                upload_time = time.perf_counter() - upload_start
                 print(f"      Upload completed in {upload_time:.1f}s")
                 print(f"      URI: {audio_file.uri}")
                 break
@@ -222,13 +284,13 @@ def main():
         # Wait for file processing
         write_status(STATUS_FILE, 2, 4, "processing", "Processing file by Gemini API...")
         print(f"[2/4] Waiting for file processing...")
-        process_start = time.time()
+        process_start = time.perf_counter()
         while audio_file.state.name == "PROCESSING":
             print("      Processing...", end="\r")
             time.sleep(2)
             audio_file = genai.get_file(audio_file.name)
 
-        process_time = time.time() - process_start
+        process_time = time.perf_counter() - process_start
 
         if audio_file.state.name == "FAILED":
             raise Exception(f"File processing failed: {audio_file.state.name}")
@@ -271,13 +333,13 @@ def main():
 
 Your entire response should be a single markdown document.'''
 
-        transcription_start = time.time()
+        transcription_start = time.perf_counter()
         response = model.generate_content(
             [prompt, audio_file],
             generation_config=generation_config,
             request_options={"timeout": REQUEST_TIMEOUT}
         )
-        transcription_time = time.time() - transcription_start
+        transcription_time = time.perf_counter() - transcription_start
         print(f"      Transcription completed in {transcription_time:.1f}s")
         print()
 
@@ -376,12 +438,5 @@ Your entire response should be a single markdown document.'''
         except:
             pass
 
-        try:
-            if 'optimized_file' in locals() and optimized_file and Path(optimized_file).exists():
-                Path(optimized_file).unlink()
-                print(f"Optimized local file removed after error.")
-        except:
-            pass
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,80 @@
+"""
+Testes unitários para o parsing de argumentos da CLI (integração Raycast)
+
+Author: MeetingScribe Team
+Python: >=3.9
+"""
+
+import importlib
+import json
+import sys
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Adicionar src/ ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+# cli/__init__ reexporta a função main, que esconde o submódulo homônimo
+cli_main = importlib.import_module("cli.main")
+
+
+class TestParseArgs(unittest.TestCase):
+    """Testes para _parse_args"""
+
+    SCHEMA = (("duration", int, 30), ("audio_format", str, "wav"))
+
+    def test_defaults_for_missing_arguments(self):
+        """Argumentos ausentes recebem os valores padrão do schema"""
+        self.assertEqual(cli_main._parse_args(self.SCHEMA, []), [30, "wav"])
+        self.assertEqual(cli_main._parse_args(self.SCHEMA, ["60"]), [60, "wav"])
+
+    def test_values_are_cast_to_schema_types(self):
+        """Valores informados são convertidos para o tipo declarado"""
+        self.assertEqual(cli_main._parse_args(self.SCHEMA, ["45", "m4a"]), [45, "m4a"])
+
+    def test_extra_arguments_are_ignored(self):
+        """Argumentos além do schema são ignorados"""
+        self.assertEqual(cli_main._parse_args(self.SCHEMA, ["10", "wav", "x"]), [10, "wav"])
+
+    def test_invalid_value_names_the_argument(self):
+        """Valor inválido gera ValueError citando o argumento"""
+        with self.assertRaises(ValueError) as ctx:
+            cli_main._parse_args(self.SCHEMA, ["abc"])
+        self.assertEqual(str(ctx.exception), "Invalid duration: 'abc'")
+
+
+class TestRecordCommandArgs(unittest.TestCase):
+    """Testes do caminho de erro JSON do comando record"""
+
+    def _run_main(self, argv):
+        stdout = StringIO()
+        with patch.object(sys, "argv", ["main.py", *argv]), \
+                patch.object(sys, "stdout", stdout):
+            cli_main.main()
+        return stdout.getvalue()
+
+    def test_invalid_duration_returns_json_error(self):
+        """Duração inválida retorna erro JSON sem iniciar a gravação"""
+        with patch.object(cli_main, "quick_record") as quick_record:
+            output = self._run_main(["record", "abc"])
+        quick_record.assert_not_called()
+        self.assertEqual(json.loads(output), {
+            "status": "error",
+            "message": "Invalid duration: 'abc'",
+        })
+
+    def test_valid_arguments_reach_quick_record(self):
+        """Argumentos válidos chegam tipados ao quick_record"""
+        thread = Mock()
+        with patch.object(cli_main, "quick_record",
+                          return_value=({"status": "success"}, thread)) as quick_record:
+            output = self._run_main(["record", "15", "m4a"])
+        quick_record.assert_called_once_with(duration=15, audio_format="m4a")
+        thread.join.assert_called_once()
+        self.assertEqual(json.loads(output), {"status": "success"})
+
+
+if __name__ == "__main__":
+    unittest.main()
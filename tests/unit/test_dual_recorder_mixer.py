@@ -0,0 +1,120 @@
+"""
+Testes unitários para o mixer do DualStreamRecorder
+
+Alimenta o _recording_worker com filas falsas (no lugar das threads leitoras)
+e verifica que nenhum chunk é perdido ou duplicado.
+
+Author: MeetingScribe Team
+Python: >=3.9
+"""
+
+import queue
+import sys
+import unittest
+from collections import deque
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Adicionar src/ ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from audio import dual_recorder
+from audio.dual_recorder import DualStreamRecorder
+
+
+class _FakeQueue:
+    """Substituto de queue.Queue preenchido pelo teste em vez de uma thread leitora"""
+
+    def __init__(self):
+        self.chunks = deque()
+        self.on_get = None
+
+    def get(self, timeout=None):
+        if self.on_get:
+            self.on_get()
+        return self.get_nowait()
+
+    def get_nowait(self):
+        if not self.chunks:
+            raise queue.Empty
+        return self.chunks.popleft()
+
+
+class TestDualStreamMixer(unittest.TestCase):
+    """Testes do pareamento speaker/microfone no _recording_worker"""
+
+    def _make_recorder(self):
+        with patch.object(dual_recorder, "PYAUDIO_AVAILABLE", True), \
+                patch.object(DualStreamRecorder, "_initialize_audio_system"):
+            recorder = DualStreamRecorder()
+        recorder._speaker_stream = Mock(is_stopped=Mock(return_value=True))
+        recorder._mic_stream = Mock(is_stopped=Mock(return_value=True))
+        recorder._stats = Mock(samples_recorded=0)
+        # Mixagem identificável: o frame misto guarda os dois chunks de origem
+        recorder._mix_audio_frames = lambda speaker, mic: ("mix", speaker, mic)
+        return recorder
+
+    def _run_mixer(self, speaker_ticks, mic_ticks):
+        """
+        Executa o mixer; antes de cada espera na fila primária (speaker), o tick
+        seguinte entrega seus chunks às duas filas, como fariam as threads leitoras.
+        """
+        recorder = self._make_recorder()
+        speaker_queue, mic_queue = _FakeQueue(), _FakeQueue()
+        recorder._speaker_queue, recorder._mic_queue = speaker_queue, mic_queue
+        ticks = deque(zip(speaker_ticks, mic_ticks))
+        waits = [0]
+
+        def deliver():
+            waits[0] += 1
+            self.assertLess(waits[0], 1000, "mixer não terminou")
+            if ticks:
+                speaker_chunks, mic_chunks = ticks.popleft()
+                speaker_queue.chunks.extend(speaker_chunks)
+                mic_queue.chunks.extend(mic_chunks)
+            elif not speaker_queue.chunks and not mic_queue.chunks:
+                recorder._recording = False
+
+        speaker_queue.on_get = deliver
+        recorder._recording = True
+        recorder._recording_worker()
+        return recorder._frames
+
+    def _assert_each_chunk_once(self, frames, speaker_ticks, mic_ticks):
+        stored = []
+        for frame in frames:
+            stored.extend(frame[1:] if isinstance(frame, tuple) else (frame,))
+        sent = [c for tick in speaker_ticks for c in tick] + [c for tick in mic_ticks for c in tick]
+        self.assertEqual(sorted(stored), sorted(sent))
+
+    def test_only_primary_has_data(self):
+        """Apenas o speaker entrega chunks: todos são gravados, em ordem"""
+        speaker = [[b"S1"], [b"S2"], [b"S3"]]
+        mic = [[], [], []]
+        frames = self._run_mixer(speaker, mic)
+        self.assertEqual(frames, [b"S1", b"S2", b"S3"])
+        self._assert_each_chunk_once(frames, speaker, mic)
+
+    def test_only_secondary_has_data(self):
+        """Loopback sem pacotes: os chunks do microfone não são descartados"""
+        speaker = [[], [], []]
+        mic = [[b"M1"], [b"M2"], [b"M3"]]
+        frames = self._run_mixer(speaker, mic)
+        self.assertEqual(frames, [b"M1", b"M2", b"M3"])
+        self._assert_each_chunk_once(frames, speaker, mic)
+
+    def test_secondary_faster_than_primary(self):
+        """Microfone com o dobro de chunks: o excedente é gravado sem mixagem"""
+        speaker = [[b"S1"], [b"S2"], [b"S3"]]
+        mic = [[b"M1", b"M2"], [b"M3", b"M4"], [b"M5", b"M6"]]
+        frames = self._run_mixer(speaker, mic)
+        self.assertEqual(frames, [
+            ("mix", b"S1", b"M1"), b"M2",
+            ("mix", b"S2", b"M3"), b"M4",
+            ("mix", b"S3", b"M5"), b"M6",
+        ])
+        self._assert_each_chunk_once(frames, speaker, mic)
+
+
+if __name__ == "__main__":
+    unittest.main()
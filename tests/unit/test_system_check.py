@@ -0,0 +1,42 @@
+"""
+Testes unitários para a montagem do JSON do system_check (Raycast)
+
+Author: MeetingScribe Team
+Python: >=3.9
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Adicionar scripts/ ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+import system_check
+
+
+class TestComponent(unittest.TestCase):
+    """Testes para _component"""
+
+    def test_ok_component(self):
+        """Resultado verdadeiro vira status ok com ícone de sucesso"""
+        self.assertEqual(
+            system_check._component("Python", True, "Python 3.11.7"),
+            {"name": "Python", "status": "ok", "message": "Python 3.11.7", "icon": "✅"},
+        )
+
+    def test_error_component(self):
+        """Resultado falso vira status error com ícone de falha"""
+        self.assertEqual(
+            system_check._component("Dir: logs", False, "Não encontrado"),
+            {"name": "Dir: logs", "status": "error", "message": "Não encontrado", "icon": "❌"},
+        )
+
+    def test_truthy_values_are_normalized(self):
+        """Valores não booleanos são tratados pela veracidade"""
+        self.assertEqual(system_check._component("x", 1, "")["status"], "ok")
+        self.assertEqual(system_check._component("x", None, "")["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Testes unitários para o backoff de polling do TeamsDetector
+
+Author: MeetingScribe Team
+Python: >=3.9
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Adicionar src/ ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from teams.teams_detector import MeetingState, TeamsDetector
+
+
+class TestNextPollInterval(unittest.TestCase):
+    """Testes para _next_poll_interval"""
+
+    def test_idle_without_candidates_backs_off_exponentially(self):
+        """Ocioso e sem processos candidatos: intervalo cresce 1.5x por tick"""
+        detector = TeamsDetector(poll_interval=1.0, max_poll_interval=100.0)
+        intervals = [detector._next_poll_interval() for _ in range(3)]
+        self.assertEqual(intervals, [1.5, 2.25, 3.375])
+
+    def test_backoff_is_capped(self):
+        """Expoente limitado a 8 ticks e intervalo limitado ao máximo"""
+        detector = TeamsDetector(poll_interval=1.0, max_poll_interval=100.0)
+        intervals = [detector._next_poll_interval() for _ in range(12)]
+        self.assertAlmostEqual(intervals[-1], 1.5 ** 8)
+        self.assertEqual(intervals[-1], intervals[7])
+
+        detector = TeamsDetector(poll_interval=2.0, max_poll_interval=30.0)
+        intervals = [detector._next_poll_interval() for _ in range(12)]
+        self.assertEqual(max(intervals), 30.0)
+
+    def test_candidate_process_resets_backoff(self):
+        """Processo do Teams/navegador presente: volta ao intervalo base"""
+        detector = TeamsDetector(poll_interval=2.0)
+        for _ in range(5):
+            detector._next_poll_interval()
+        detector._candidates_present = True
+        self.assertEqual(detector._next_poll_interval(), 2.0)
+        self.assertEqual(detector._idle_ticks, 0)
+
+    def test_non_idle_state_polls_at_base_interval(self):
+        """Reunião em andamento: sem backoff, mesmo sem candidatos"""
+        detector = TeamsDetector(poll_interval=2.0)
+        detector.state = MeetingState.RECORDING
+        self.assertEqual([detector._next_poll_interval() for _ in range(3)], [2.0, 2.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Testes unitários para os helpers de áudio do transcriber
+
+Author: MeetingScribe Team
+Python: >=3.9
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar src/ ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from transcriber import downmix_mono
+
+
+class TestDownmixMono(unittest.TestCase):
+    """Testes para downmix_mono"""
+
+    def test_stereo_is_channel_average(self):
+        """Estéreo: média dos dois canais, em float32"""
+        audio = np.array([[0.5, -0.5], [1.0, 0.0], [0.25, 0.75]], dtype=np.float32)
+        mono = downmix_mono(audio)
+        self.assertEqual(mono.dtype, np.float32)
+        np.testing.assert_allclose(mono, [0.0, 0.5, 0.5])
+
+    def test_multichannel_matches_mean(self):
+        """Mais de dois canais: mesmo resultado que np.mean por frame"""
+        rng = np.random.default_rng(0)
+        audio = rng.uniform(-1.0, 1.0, size=(64, 6)).astype(np.float32)
+        mono = downmix_mono(audio)
+        self.assertEqual(mono.dtype, np.float32)
+        self.assertEqual(mono.shape, (64,))
+        np.testing.assert_allclose(mono, audio.mean(axis=1), rtol=1e-6, atol=1e-7)
+
+    def test_writes_into_provided_buffer(self):
+        """Com out=, o resultado é escrito no buffer informado (estéreo e multicanal)"""
+        for channels in (2, 4):
+            audio = np.full((8, channels), 0.5, dtype=np.float32)
+            out = np.empty(8, dtype=np.float32)
+            mono = downmix_mono(audio, out=out)
+            self.assertIs(mono, out)
+            np.testing.assert_allclose(out, 0.5)
+
+    def test_provided_buffer_may_be_a_block_prefix(self):
+        """Bloco final menor: out pode ser uma fatia do buffer de saída"""
+        audio = np.ones((3, 2), dtype=np.float32)
+        buffer = np.zeros(8, dtype=np.float32)
+        downmix_mono(audio, out=buffer[2:5])
+        np.testing.assert_allclose(buffer, [0, 0, 1, 1, 1, 0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()